@@ -0,0 +1,121 @@
+"""Rerun cost per interaction: full-script rerun vs. fragment-scoped rerun.
+
+    python benchmarks/fragment_rerun.py [--iterations 30]
+
+AppTest always re-executes the whole script, which is exactly what a widget
+outside any fragment costs. For widgets inside an st.fragment the real server
+queues only that fragment, so the "fragment" rows replay that: the same
+interaction is rerun with the fragment's id queued, as the browser would.
+
+Timings are of script execution only (AppTest's own polling is excluded), plus
+the number of elements the rerun emitted.
+"""
+import argparse
+import functools
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from streamlit.runtime.scriptrunner import script_runner
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@contextmanager
+def fragment_scope(fragment_id: str | None):
+    if fragment_id is None:
+        yield
+        return
+    scoped = functools.partial(RerunData, fragment_id_queue=[fragment_id])
+    with mock.patch.object(local_script_runner, "RerunData", scoped):
+        yield
+
+
+def fragment_ids(at: AppTest) -> list[str]:
+    return list(getattr(at._fragment_storage, "_fragments", {}))
+
+
+def fragment_for(at: AppTest, probe) -> str | None:
+    """The id of the fragment whose rerun re-renders the widget found by `probe`."""
+    for fid in fragment_ids(at):
+        with fragment_scope(fid):
+            at.run()
+        try:
+            probe(at)
+            return fid
+        except (KeyError, IndexError):
+            continue
+        finally:
+            at.run()
+    return None
+
+
+@contextmanager
+def exec_timer(samples: list[float]):
+    """Record how long each script (or fragment) execution takes."""
+    original = script_runner.exec_func_with_error_handling
+
+    def timed_exec(func, ctx):
+        t0 = time.perf_counter()
+        try:
+            return original(func, ctx)
+        finally:
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    with mock.patch.object(script_runner, "exec_func_with_error_handling", timed_exec):
+        yield
+
+
+def timed(at: AppTest, fn, iterations: int) -> tuple[list[float], int]:
+    samples: list[float] = []
+    with exec_timer(samples):
+        for i in range(iterations):
+            fn(i)
+    return samples, count_elements(at._tree)
+
+
+def count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if children is None:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def summarize(name: str, result: tuple[list[float], int]):
+    samples, elements = result
+    print(f"{name:<34} p50 {statistics.median(samples):7.2f} ms   mean {statistics.fmean(samples):7.2f} ms   elements {elements}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    at = AppTest.from_file(str(APP), default_timeout=30)
+    at.run()
+    slider = lambda a: a.slider(key="feedback_rating")
+    fid = fragment_for(at, slider)
+
+    def move(i):
+        slider(at).set_value(i % 5 + 1).run()
+
+    summarize("feedback_rating (full rerun)", timed(at, move, args.iterations))
+    if fid is None:
+        print("feedback_rating is not inside a fragment; every move reruns the whole page")
+        return
+
+    def move_scoped(i):
+        widget = slider(at).set_value(i % 5 + 1)
+        with fragment_scope(fid):
+            widget.run()
+
+    summarize("feedback_rating (fragment rerun)", timed(at, move_scoped, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
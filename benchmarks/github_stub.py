@@ -0,0 +1,77 @@
+"""Minimal in-process GitHub REST stub for local runs of the projects section.
+
+    server = github_stub.start()        # 127.0.0.1, ephemeral port, SAMPLE_REPOS
+    os.environ["PORTFOLIO_GITHUB_API"] = github_stub.url(server)
+
+Serves GET /users/<user>/repos with an ETag and answers a matching
+If-None-Match with 304, like the real API.
+"""
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests += 1
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "users" or parts[2] != "repos":
+            self.send_error(404)
+            return
+        body = json.dumps(self.server.repos).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubGitHubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, repos: list[dict]):
+        super().__init__(address, _Handler)
+        self.repos = repos  # replace to simulate a change upstream
+        self.requests = 0
+        self.not_modified = 0
+
+
+def repo(name: str, stars: int = 0, language: str = "Python", **extra) -> dict:
+    """A repo in the shape the REST API returns (only the fields the app reads)."""
+    return {
+        "name": name, "html_url": f"https://github.com/stub/{name}", "description": f"{name} description",
+        "language": language, "stargazers_count": stars, "forks_count": 0, "pushed_at": "2024-01-01T00:00:00Z",
+        "fork": False, "archived": False, **extra,
+    }
+
+
+SAMPLE_REPOS = [
+    repo("streaming-pipeline", 42, "Java"),
+    repo("k8s-operators", 17, "Go"),
+    repo("portfolio", 9, "Python"),
+    repo("dotfiles", 3, "Shell"),
+    repo("forked-lib", 500, fork=True),
+]
+
+
+def start(repos: list[dict] = SAMPLE_REPOS, host: str = "127.0.0.1", port: int = 0) -> StubGitHubServer:
+    server = StubGitHubServer((host, port), repos)
+    threading.Thread(target=server.serve_forever, name="github-stub", daemon=True).start()
+    return server
+
+
+def url(server: StubGitHubServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,445 @@
+"""Concurrent load test: many simulated visitors running the real interaction script.
+
+    python benchmarks/loadtest.py server --start --visitors 300 --concurrency 100
+    python benchmarks/loadtest.py server --url http://127.0.0.1:8501 --pid <server pid>
+    python benchmarks/loadtest.py apptest --visitors 200 --workers 8
+
+Every visitor loads the page, moves the feedback slider a few times, opens the
+contact dialog and submits it; mail goes to an in-process stub SMTP.
+
+`server` speaks Streamlit's websocket protocol to a running server the way the
+browser does, fragment-scoped reruns included; `--start` launches one on a free
+port with scratch data and stub SMTP secrets. Latency is from sending the rerun
+request to receiving script_finished. Server RSS and CPU come from psutil if
+installed, else /proc (Linux).
+
+`apptest` drives the script in-process with AppTest across a process pool, one
+visitor at a time per worker. Latency there is script execution only, and
+resource figures are the workers' own.
+
+Reports throughput, p50/p95/p99 latency overall and per step, and any errors.
+Submissions past the contact rate limits are counted under "rate_limited":
+every server-mode visitor comes from 127.0.0.1, so the per-IP limit applies.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+APP = ROOT / "app.py"
+
+FEEDBACK_MOVES = 3
+
+
+# ----------------------------
+# Reporting
+# ----------------------------
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+    return {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(ordered[-1], 2)}
+
+
+def report(mode: str, samples: list[tuple[str, float]], outcomes: dict, errors: list[str], elapsed: float,
+           visitors: int, resources: dict) -> dict:
+    steps = {}
+    for step, ms in samples:
+        steps.setdefault(step, []).append(ms)
+    return {
+        "mode": mode,
+        "visitors": visitors,
+        "seconds": round(elapsed, 2),
+        "reruns": len(samples),
+        "reruns_per_second": round(len(samples) / elapsed, 1) if elapsed else 0,
+        "visitors_per_second": round(visitors / elapsed, 2) if elapsed else 0,
+        "latency_ms": percentiles([ms for _, ms in samples]),
+        "steps": {step: percentiles(values) for step, values in steps.items()},
+        "outcomes": outcomes,
+        "errors": len(errors),
+        "first_errors": errors[:5],
+        "resources": resources,
+    }
+
+
+def print_report(result: dict):
+    lat = result["latency_ms"]
+    print(f"{result['visitors']} visitors, {result['reruns']} reruns in {result['seconds']} s "
+          f"({result['reruns_per_second']} reruns/s, {result['visitors_per_second']} visitors/s)")
+    if lat:
+        print(f"latency ms  p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+    for step, p in result["steps"].items():
+        print(f"  {step:<14} p50 {p['p50']:8.2f}  p95 {p['p95']:8.2f}  p99 {p['p99']:8.2f}")
+    print(f"outcomes {result['outcomes']}  errors {result['errors']}")
+    for error in result["first_errors"]:
+        print(f"  ! {error}")
+    if result["resources"]:
+        print("resources " + "  ".join(f"{k} {v}" for k, v in result["resources"].items()))
+
+
+# ----------------------------
+# Server resource sampling
+# ----------------------------
+def _proc_sample(pid: int) -> tuple[int, float]:
+    """(RSS bytes, CPU seconds) for `pid`."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        proc = psutil.Process(pid)
+        cpu = proc.cpu_times()
+        return proc.memory_info().rss, cpu.user + cpu.system
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/status") as f:
+        rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+    return rss, cpu
+
+
+class ResourceSampler:
+    def __init__(self, pid: int | None, interval: float = 0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        if self.pid:
+            self.start_rss, self.start_cpu = _proc_sample(self.pid)
+            self.t0 = time.perf_counter()
+            threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.peak_rss = max(self.peak_rss, _proc_sample(self.pid)[0])
+            except (OSError, ValueError):
+                return
+
+    def __exit__(self, *exc):
+        self._stop.set()
+
+    def result(self) -> dict:
+        if not self.pid:
+            return {}
+        rss, cpu = _proc_sample(self.pid)
+        elapsed = time.perf_counter() - self.t0
+        return {
+            "server_rss_start_mb": round(self.start_rss / 2**20, 1),
+            "server_rss_peak_mb": round(max(self.peak_rss, rss) / 2**20, 1),
+            "server_cpu_seconds": round(cpu - self.start_cpu, 2),
+            "server_cpu_percent": round(100 * (cpu - self.start_cpu) / elapsed, 1) if elapsed else 0,
+        }
+
+
+# ----------------------------
+# Server mode: the browser's websocket protocol
+# ----------------------------
+class Visitor:
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets: dict[str, object] = {}  # widget id -> WidgetState carrying its current value
+        self.elements: list[tuple[str, str, object]] = []  # (element type, fragment id, element proto)
+
+    async def rerun(self, fragment_id: str = "", triggers=()) -> float:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        states = msg.rerun_script.widget_states.widgets
+        for state in self.widgets.values():
+            states.append(state)
+        for trigger in triggers:
+            states.append(trigger)
+        self.elements = []
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                self.elements.append((element.WhichOneof("type"), fwd.delta.fragment_id, element))
+            elif kind == "script_finished":
+                return (time.perf_counter() - t0) * 1000
+
+    def find(self, kind: str, match) -> tuple[str, object]:
+        for element_type, fragment_id, element in self.elements:
+            if element_type == kind and match(getattr(element, kind)):
+                return fragment_id, getattr(element, kind)
+        raise LookupError(f"no {kind} in the last rerun")
+
+    def set_value(self, widget_id: str, field: str, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget_id)
+        target = getattr(state, field)
+        if hasattr(target, "data"):
+            target.data.extend(value)
+        else:
+            setattr(state, field, value)
+        self.widgets[widget_id] = state
+
+    def texts(self) -> str:
+        return " ".join(getattr(element, kind).body for kind, _, element in self.elements
+                        if kind in ("alert", "markdown"))
+
+
+async def server_visitor(url: str, n: int, samples: list, outcomes: dict, errors: list):
+    import websockets
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    stream = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+    try:
+        async with websockets.connect(stream, subprotocols=["streamlit"], max_size=None) as ws:
+            v = Visitor(ws)
+            samples.append(("load", await v.rerun()))
+            slider_fragment, slider = v.find("slider", lambda w: w.id.endswith("feedback_rating"))
+            cta_fragment, cta = v.find("button", lambda w: w.id.endswith("sticky_contact"))
+
+            for i in range(FEEDBACK_MOVES):
+                v.set_value(slider.id, "double_array_value", [random.randint(1, 5)])
+                samples.append(("feedback", await v.rerun(slider_fragment)))
+
+            samples.append(("open_dialog", await v.rerun(cta_fragment, [WidgetState(id=cta.id, trigger_value=True)])))
+            values = {"email": f"load-{n}@example.com", "phone": "+1 469 347 5994", "notes": f"load test visitor {n}"}
+            try:
+                # The browser-validated form (portfolio/contact_form.py) posts one JSON value
+                dialog_fragment, form = v.find("component_instance", lambda w: w.component_name.endswith("contact_form"))
+            except LookupError:
+                dialog_fragment, email = v.find("text_input", lambda w: w.label.startswith("Email"))
+                _, phone = v.find("text_input", lambda w: w.label.startswith("Phone"))
+                _, notes = v.find("text_area", lambda w: True)
+                _, submit = v.find("button", lambda w: w.is_form_submitter)
+                v.set_value(email.id, "string_value", values["email"])
+                v.set_value(phone.id, "string_value", values["phone"])
+                v.set_value(notes.id, "string_value", values["notes"])
+                triggers = [WidgetState(id=submit.id, trigger_value=True)]
+            else:
+                v.set_value(form.id, "json_value", json.dumps({**values, "nonce": f"load-{n}"}))
+                triggers = []
+            samples.append(("submit", await v.rerun(dialog_fragment, triggers)))
+
+            texts = v.texts()
+            outcome = ("sent" if "Thanks!" in texts else "rate_limited" if "Too many" in texts
+                       else "duplicate" if "already sent" in texts else "other")
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    except Exception as e:
+        errors.append(f"visitor {n}: {type(e).__name__}: {e}")
+
+
+async def run_server(url: str, visitors: int, concurrency: int) -> tuple[list, dict, list, float]:
+    samples, outcomes, errors = [], {}, []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(n):
+        async with gate:
+            await server_visitor(url, n, samples, outcomes, errors)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(visitors)))
+    return samples, outcomes, errors, time.perf_counter() - t0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(smtp_secrets: dict, scratch: Path) -> tuple[subprocess.Popen, str]:
+    secrets = scratch / "secrets.toml"
+    secrets.write_text("".join(f"{k} = {json.dumps(v)}\n" for k, v in smtp_secrets.items()))
+    port = _free_port()
+    env = dict(os.environ, PORTFOLIO_DB=str(scratch / "submissions.db"),
+               PORTFOLIO_FEEDBACK_LOG=str(scratch / "feedback.jsonl"))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP), "--server.headless", "true",
+         "--server.port", str(port), "--secrets.files", str(secrets), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=(scratch / "server.log").open("w"),
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return proc, url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit(f"server did not come up; see {scratch / 'server.log'}")
+
+
+# ----------------------------
+# AppTest mode: in-process across a process pool
+# ----------------------------
+def apptest_worker(first: int, count: int, smtp_secrets: dict, scratch: str) -> dict:
+    import resource
+
+    os.environ["PORTFOLIO_DB"] = str(Path(scratch) / f"submissions-{os.getpid()}.db")
+    os.environ["PORTFOLIO_FEEDBACK_LOG"] = str(Path(scratch) / f"feedback-{os.getpid()}.jsonl")
+    os.environ["PORTFOLIO_CONTACT_FORM"] = "streamlit"  # AppTest can't drive custom components
+    os.chdir(ROOT)
+    sys.path[:0] = [str(HERE), str(ROOT)]
+    from fragment_rerun import exec_timer, fragment_for, fragment_ids, fragment_scope
+    from streamlit.testing.v1 import AppTest
+
+    samples, outcomes, errors = [], {}, []
+
+    def timed(step, run):
+        execs = []
+        with exec_timer(execs):
+            run()
+        samples.append((step, sum(execs)))
+
+    for n in range(first, first + count):
+        try:
+            # AppTest sessions share one session id; give each visitor fresh contact limits
+            from portfolio.ratelimit import CONTACT_GUARD
+            CONTACT_GUARD.__init__()
+            at = AppTest.from_file(str(APP), default_timeout=30)
+            at.secrets.update(smtp_secrets)
+            timed("load", at.run)
+            slider_fragment = fragment_for(at, lambda a: a.slider(key="feedback_rating"))
+            cta_fragment = fragment_for(at, lambda a: a.button(key="sticky_contact"))
+            for _ in range(FEEDBACK_MOVES):
+                widget = at.slider(key="feedback_rating").set_value(random.randint(1, 5))
+                with fragment_scope(slider_fragment):
+                    timed("feedback", widget.run)
+            at.run()
+            before = set(fragment_ids(at))
+            widget = at.button(key="sticky_contact").click()
+            with fragment_scope(cta_fragment):
+                timed("open_dialog", widget.run)
+            dialog = next(f for f in fragment_ids(at) if f not in before)
+            at.text_input[0].input(f"load-{n}@example.com")
+            at.text_input[1].input("+1 469 347 5994")
+            at.text_area[0].input(f"load test visitor {n}")
+            widget = at.get("form_submit_button")[0].click()
+            with fragment_scope(dialog):
+                timed("submit", widget.run)
+            outcome = "sent" if at.success else "rate_limited" if at.error else "other"
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        except Exception as e:
+            errors.append(f"visitor {n}: {type(e).__name__}: {e}")
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "samples": samples, "outcomes": outcomes, "errors": errors,
+        "rss_mb": usage.ru_maxrss / 1024, "cpu_seconds": usage.ru_utime + usage.ru_stime,
+    }
+
+
+def run_apptest(visitors: int, workers: int, smtp_secrets: dict, scratch: Path) -> tuple[list, dict, list, float, dict]:
+    share, extra = divmod(visitors, workers)
+    batches, first = [], 0
+    for w in range(workers):
+        count = share + (w < extra)
+        if count:
+            batches.append((first, count))
+            first += count
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(apptest_worker, *zip(*batches), [smtp_secrets] * len(batches),
+                                [str(scratch)] * len(batches)))
+    elapsed = time.perf_counter() - t0
+    samples, outcomes, errors = [], {}, []
+    for r in results:
+        samples += r["samples"]
+        errors += r["errors"]
+        for k, v in r["outcomes"].items():
+            outcomes[k] = outcomes.get(k, 0) + v
+    resources = {
+        "workers": len(results),
+        "worker_rss_peak_mb": round(max(r["rss_mb"] for r in results), 1),
+        "worker_rss_total_mb": round(sum(r["rss_mb"] for r in results), 1),
+        "worker_cpu_seconds": round(sum(r["cpu_seconds"] for r in results), 2),
+    }
+    return samples, outcomes, errors, elapsed, resources
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent visitor load test for app.py")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    server = sub.add_parser("server", help="drive a running Streamlit server over its websocket")
+    target = server.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="e.g. http://127.0.0.1:8501")
+    target.add_argument("--start", action="store_true", help="start a server on a free port with stub SMTP")
+    server.add_argument("--pid", type=int, help="server pid, for RSS/CPU (implied by --start)")
+    server.add_argument("--concurrency", type=int, default=50, help="visitors connected at once")
+    apptest = sub.add_parser("apptest", help="run AppTest sessions across a process pool")
+    apptest.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    for p in (server, apptest):
+        p.add_argument("--visitors", type=int, default=100)
+        p.add_argument("--digest", type=float, default=0, metavar="SECONDS",
+                       help="batch contact emails into digests over this window")
+        p.add_argument("--out", type=Path, help="also write the report as JSON")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(HERE))
+    import github_stub
+    import smtp_stub
+
+    smtp = smtp_stub.start()
+    smtp_secrets = smtp_stub.secrets(smtp)
+    if args.digest:
+        smtp_secrets["CONTACT_DIGEST_SECONDS"] = args.digest
+    scratch = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    # Inherited by a --start server and by the AppTest workers
+    os.environ["PORTFOLIO_GITHUB_API"] = github_stub.url(github_stub.start())
+    os.environ["PORTFOLIO_GITHUB_CACHE"] = str(scratch / "github")
+
+    if args.mode == "server":
+        proc = None
+        url, pid = args.url, args.pid
+        if args.start:
+            proc, url = start_server(smtp_secrets, scratch)
+            pid = proc.pid
+        try:
+            with ResourceSampler(pid) as sampler:
+                samples, outcomes, errors, elapsed = asyncio.run(run_server(url, args.visitors, args.concurrency))
+            resources = sampler.result()
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(10)
+    else:
+        samples, outcomes, errors, elapsed, resources = run_apptest(args.visitors, args.workers, smtp_secrets, scratch)
+    if args.digest:
+        time.sleep(args.digest + 1)  # let the last batch go out
+    resources["smtp_connections"] = smtp.connections
+    resources["smtp_delivered"] = smtp.delivered
+
+    result = report(args.mode, samples, outcomes, errors, elapsed, args.visitors, resources)
+    print_report(result)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2) + "\n")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
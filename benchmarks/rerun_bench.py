@@ -0,0 +1,314 @@
+"""Headless benchmark of what each real interaction with app.py costs a rerun.
+
+    python benchmarks/rerun_bench.py [--iterations 20] [--out build/bench/rerun.json]
+                                     [--budgets benchmarks/budgets.json]
+                                     [--baseline previous.json --max-regression 0.25]
+
+Scenarios, each scripted through AppTest the way the browser drives the server:
+
+    cold_load            a new session's first run
+    feedback_rating      moving the slider (reruns the feedback fragment only)
+    open_contact_dialog  clicking the sticky CTA
+    submit_contact_form  submitting the dialog's form, mailed to a local stub SMTP
+    expand_experience    opening every timeline entry on the first page
+
+Per scenario it records wall time and script-execution time, the elements and
+deltas the rerun emitted and the serialized size of every ForwardMsg sent. The
+results are written as JSON; the run fails (exit 1) if a metric exceeds its
+budget in budgets.json or regresses past --max-regression against --baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+from fragment_rerun import APP, count_elements, exec_timer, fragment_for, fragment_ids, fragment_scope
+
+ROOT = APP.parent
+BUDGETS = Path(__file__).resolve().parent / "budgets.json"
+DEFAULT_OUT = ROOT / "build" / "bench" / "rerun.json"
+
+# Keys of the timeline's lazy expanders and "Show more" button; each opens or
+# loads entries with a rerun of the timeline fragment.
+EXPAND_PREFIX = "timeline_"
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+@contextmanager
+def capture_messages(messages: list):
+    """Collect every ForwardMsg a run emits (AppTest parses them into its element tree)."""
+    from streamlit.testing.v1 import local_script_runner
+
+    original = local_script_runner.parse_tree_from_messages
+
+    def capturing(msgs):
+        messages.extend(msgs)
+        return original(msgs)
+
+    with mock.patch.object(local_script_runner, "parse_tree_from_messages", capturing):
+        yield
+
+
+class Recorder:
+    def __init__(self):
+        self.wall_ms: list[float] = []
+        self.exec_ms: list[float] = []
+        self.reruns: list[int] = []
+        self.elements: list[int] = []
+        self.deltas: list[int] = []
+        self.bytes: list[int] = []
+
+    @contextmanager
+    def measure(self, at):
+        messages, execs = [], []
+        t0 = time.perf_counter()
+        with capture_messages(messages), exec_timer(execs):
+            yield
+        self.wall_ms.append((time.perf_counter() - t0) * 1000)
+        self.exec_ms.append(sum(execs))
+        self.reruns.append(len(execs))
+        self.elements.append(count_elements(at._tree) if execs else 0)
+        self.deltas.append(sum(1 for m in messages if m.WhichOneof("type") == "delta"))
+        self.bytes.append(sum(m.ByteSize() for m in messages))
+
+    def summary(self) -> dict:
+        def dist(samples):
+            ordered = sorted(samples)
+            return {
+                "p50": round(statistics.median(ordered), 3),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                "max": round(ordered[-1], 3),
+            }
+        return {
+            "iterations": len(self.wall_ms),
+            "wall_ms": dist(self.wall_ms),
+            "exec_ms": dist(self.exec_ms),
+            # Counts are deterministic per interaction; report the largest seen
+            "reruns": max(self.reruns),
+            "elements": max(self.elements),
+            "deltas": max(self.deltas),
+            "bytes": max(self.bytes),
+        }
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+def new_session(secrets: dict):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=30)
+    at.secrets.update(secrets)
+    return at
+
+
+def reset_guard():
+    # Every iteration is a fresh visitor as far as the contact rate limits go
+    from portfolio.ratelimit import CONTACT_GUARD
+    CONTACT_GUARD.__init__()
+
+
+def cold_load(secrets: dict, iterations: int) -> Recorder:
+    rec = Recorder()
+    for _ in range(iterations):
+        at = new_session(secrets)
+        with rec.measure(at):
+            at.run()
+    return rec
+
+
+def feedback_rating(secrets: dict, iterations: int) -> Recorder:
+    rec = Recorder()
+    at = new_session(secrets)
+    at.run()
+    slider = lambda a: a.slider(key="feedback_rating")
+    fid = fragment_for(at, slider)
+    for i in range(iterations):
+        widget = slider(at).set_value(i % 5 + 1)
+        with rec.measure(at), fragment_scope(fid):
+            widget.run()
+    return rec
+
+
+def open_contact_dialog(secrets: dict, iterations: int) -> Recorder:
+    rec = Recorder()
+    at = new_session(secrets)
+    at.run()
+    fid = fragment_for(at, lambda a: a.button(key="sticky_contact"))
+    for _ in range(iterations):
+        reset_guard()
+        widget = at.button(key="sticky_contact").click()
+        with rec.measure(at), fragment_scope(fid):
+            widget.run()
+    return rec
+
+
+def submit_contact_form(secrets: dict, iterations: int) -> Recorder:
+    rec = Recorder()
+    at = new_session(secrets)
+    at.run()
+    cta = fragment_for(at, lambda a: a.button(key="sticky_contact"))
+    for i in range(iterations):
+        reset_guard()
+        at.run()  # back to the full page; the last scoped run left only the dialog in the tree
+        before = set(fragment_ids(at))
+        with fragment_scope(cta):
+            at.button(key="sticky_contact").click().run()
+        # The dialog is a fragment of its own; its form submit reruns only the dialog
+        dialog = next((f for f in fragment_ids(at) if f not in before), None)
+        at.text_input[0].input(f"bench-{i}@example.com")
+        at.text_input[1].input("+1 469 347 5994")
+        at.text_area[0].input("benchmark")
+        widget = at.get("form_submit_button")[0].click()
+        with rec.measure(at), fragment_scope(dialog):
+            widget.run()
+        if at.exception or not at.success:
+            raise RuntimeError(f"contact form submit failed: {at.exception or [e.value for e in at.error]}")
+    return rec
+
+
+def _expandable(at) -> list:
+    return [w for w in [*at.expander, *at.toggle, *at.button] if str(getattr(w, "key", "") or "").startswith(EXPAND_PREFIX)]
+
+
+def expand_experience(secrets: dict, iterations: int) -> Recorder:
+    rec = Recorder()
+    at = new_session(secrets)
+    at.run()
+    fragment = fragment_for(at, lambda a: _expandable(a)[0])
+    for _ in range(iterations):
+        at.run()
+        keys = [w.key for w in _expandable(at)]
+        if not keys:
+            # Nothing to click server-side: opening an entry costs no rerun at all
+            with rec.measure(at):
+                pass
+            continue
+        for key in keys:
+            # Re-found each time: a scoped rerun leaves only the fragment in the tree
+            widget = next(w for w in _expandable(at) if w.key == key)
+            if widget.type == "expander":
+                # A lazy expander (on_change="rerun") reports its open state like a widget
+                at.session_state[key] = not at.session_state[key]
+                run = at.run
+            elif hasattr(widget, "set_value"):
+                run = widget.set_value(not widget.value).run
+            else:
+                run = widget.click().run
+            with rec.measure(at), fragment_scope(fragment):
+                run()
+    return rec
+
+
+SCENARIOS = {
+    "cold_load": cold_load,
+    "feedback_rating": feedback_rating,
+    "open_contact_dialog": open_contact_dialog,
+    "submit_contact_form": submit_contact_form,
+    "expand_experience": expand_experience,
+}
+
+
+# ----------------------------
+# Budgets
+# ----------------------------
+def _metric(result: dict, path: str):
+    value = result
+    for part in path.split("."):
+        value = value[part]
+    return value
+
+
+def check(results: dict, budgets: dict, baseline: dict | None, max_regression: float) -> list[str]:
+    failures = []
+    for scenario, limits in budgets.items():
+        if scenario not in results:
+            continue
+        for path, limit in limits.items():
+            value = _metric(results[scenario], path)
+            if value > limit:
+                failures.append(f"{scenario}.{path} = {value} exceeds budget {limit}")
+    if baseline:
+        for scenario, result in results.items():
+            previous = baseline.get("scenarios", {}).get(scenario)
+            if not previous:
+                continue
+            for path in ("exec_ms.p50", "elements", "deltas", "bytes"):
+                old, new = _metric(previous, path), _metric(result, path)
+                if old and new > old * (1 + max_regression):
+                    failures.append(f"{scenario}.{path} regressed {old} -> {new} (> {max_regression:.0%})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rerun latency / delta / payload benchmarks for app.py")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="run only these (repeatable)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--budgets", type=Path, default=BUDGETS, help="absolute limits per scenario metric")
+    parser.add_argument("--baseline", type=Path, help="previous results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed relative growth vs --baseline")
+    args = parser.parse_args()
+
+    # Keep submissions and feedback out of the real data/ directory
+    scratch = Path(tempfile.mkdtemp(prefix="rerun-bench-"))
+    os.environ["PORTFOLIO_DB"] = str(scratch / "submissions.db")
+    os.environ["PORTFOLIO_FEEDBACK_LOG"] = str(scratch / "feedback.jsonl")
+    # AppTest can't drive custom components; the server-side submit path is the same either way
+    os.environ["PORTFOLIO_CONTACT_FORM"] = "streamlit"
+    os.chdir(ROOT)  # AppTest picks up .streamlit/config.toml from the working directory
+    sys.path.insert(0, str(ROOT))
+
+    import github_stub
+    import smtp_stub
+    import streamlit as st
+
+    smtp = smtp_stub.start()
+    secrets = smtp_stub.secrets(smtp)
+    # The projects section reads from a local GitHub stub, never the real API
+    os.environ["PORTFOLIO_GITHUB_API"] = github_stub.url(github_stub.start())
+    os.environ["PORTFOLIO_GITHUB_CACHE"] = str(scratch / "github")
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = SCENARIOS[name](secrets, args.iterations).summary()
+        r = results[name]
+        print(
+            f"{name:<20} exec p50 {r['exec_ms']['p50']:7.2f} ms  wall p50 {r['wall_ms']['p50']:7.2f} ms  "
+            f"reruns {r['reruns']}  elements {r['elements']:3}  deltas {r['deltas']:3}  bytes {r['bytes']:7}"
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "static_assets": bool(st.get_option("server.enableStaticServing")),
+            "iterations": args.iterations,
+        },
+        "scenarios": results,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {args.out}")
+
+    budgets = json.loads(args.budgets.read_text()) if args.budgets and args.budgets.exists() else {}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    failures = check(results, budgets, baseline, args.max_regression)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Minimal in-process SMTP sink for benchmarks: accepts everything, stores nothing.
+
+    server = smtp_stub.start()          # 127.0.0.1, ephemeral port
+    secrets = smtp_stub.secrets(server) # SMTP_* settings for portfolio.outbox
+"""
+import socketserver
+import threading
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        self._reply("220 smtp-stub ready")
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    self.server.delivered += 1
+                    self._reply("250 queued")
+                continue
+            verb = line[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 smtp-stub")
+            elif verb == "DATA":
+                in_data = True
+                self._reply("354 end with <CRLF>.<CRLF>")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+    def _reply(self, text: str):
+        self.wfile.write(text.encode() + b"\r\n")
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, _Handler)
+        self.connections = 0
+        self.delivered = 0
+
+
+def start(host: str = "127.0.0.1", port: int = 0) -> StubSMTPServer:
+    server = StubSMTPServer((host, port))
+    threading.Thread(target=server.serve_forever, name="smtp-stub", daemon=True).start()
+    return server
+
+
+def secrets(server: StubSMTPServer) -> dict:
+    host, port = server.server_address[:2]
+    return {
+        "EMAIL_TO": "owner@example.com",
+        "EMAIL_FROM": "portfolio@example.com",
+        "GMAIL_APP_PASSWORD": "",
+        "SMTP_HOST": host,
+        "SMTP_PORT": port,
+        "SMTP_TLS": "none",
+    }
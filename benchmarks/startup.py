@@ -0,0 +1,105 @@
+"""Cold-start import cost of app.py's first run, measured with `python -X importtime`.
+
+    python benchmarks/startup.py                 # compare against startup_baseline.json
+    python benchmarks/startup.py --update        # re-record the baseline
+
+Both sides run under AppTest, and the floor is an empty script, so the report is
+everything the first render of app.py imports on top of what Streamlit itself
+needs, wherever in the script the import statement sits: total self time, the
+slowest modules, and any module in LAZY that was loaded on the first render. The run fails (exit 1)
+if a LAZY module shows up, or if the total grows past --max-regression over the
+checked-in baseline.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+APP = ROOT / "app.py"
+BASELINE = HERE / "startup_baseline.json"
+
+# Only needed on a contact submit, a variant rebuild, a CLI run or with metrics on
+LAZY = ("smtplib", "email.message", "sqlite3", "PIL", "http.server", "urllib.request", "argparse", "csv", "base64")
+
+
+_RUN = "from streamlit.testing.v1 import AppTest\nAppTest.{}.run()\n"
+FLOOR = _RUN.format("from_string('import streamlit as st')")
+
+
+def first_run(path: Path = APP) -> str:
+    """Source that renders `path` once, the way a first visitor's session would."""
+    return _RUN.format(f"from_file({str(path)!r}, default_timeout=60)")
+
+
+def importtime(code: str) -> dict[str, tuple[int, int]]:
+    """{module: (self_us, cumulative_us)} from a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure(runs: int) -> dict:
+    code = first_run()
+    totals, extras = [], {}
+    for _ in range(runs):
+        floor = importtime(FLOOR)
+        modules = importtime(code)
+        extra = {name: t for name, t in modules.items() if name not in floor}
+        totals.append(sum(self_us for self_us, _ in extra.values()))
+        for name, (self_us, _) in extra.items():
+            extras.setdefault(name, []).append(self_us)
+    return {
+        "app_imports_ms": round(statistics.median(totals) / 1000, 2),
+        "modules": len(extras),
+        # Median self time per module, slowest first
+        "slowest": {
+            name: round(statistics.median(samples) / 1000, 2)
+            for name, samples in sorted(extras.items(), key=lambda kv: -statistics.median(kv[1]))[:15]
+        },
+        "eager_lazy_modules": sorted(name for name in extras if name in LAZY),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget for app.py")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--update", action="store_true", help="write the result as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.5, help="allowed relative growth over the baseline")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(f"app.py first-run imports on top of streamlit: {result['app_imports_ms']:.2f} ms across {result['modules']} modules")
+    for name, ms in result["slowest"].items():
+        print(f"  {ms:7.2f} ms  {name}")
+
+    if args.update:
+        BASELINE.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"wrote {BASELINE.relative_to(ROOT)}")
+        return
+
+    failures = [f"{name} is imported on the first render; import it where it's used" for name in result["eager_lazy_modules"]]
+    if BASELINE.exists():
+        baseline = json.loads(BASELINE.read_text())
+        limit = baseline["app_imports_ms"] * (1 + args.max_regression)
+        print(f"baseline {baseline['app_imports_ms']:.2f} ms, limit {limit:.2f} ms")
+        if result["app_imports_ms"] > limit:
+            failures.append(f"app imports took {result['app_imports_ms']:.2f} ms (limit {limit:.2f} ms)")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
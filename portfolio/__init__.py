@@ -0,0 +1 @@
+"""Support modules for the Streamlit portfolio app (app.py)."""
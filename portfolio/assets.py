@@ -0,0 +1,132 @@
+"""Process-wide cache for encoded asset bytes and fingerprinted static URLs."""
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from portfolio.lru import SHARED
+
+ROOT = Path(__file__).resolve().parent.parent
+# Streamlit serves <main script dir>/static at app/static/ when server.enableStaticServing is on
+STATIC_DIR = ROOT / "static"
+PUBLISHED_DIR = STATIC_DIR / "_assets"
+PUBLISHED_URL = "app/static/_assets"
+
+
+def write_atomic(target: Path, data: bytes):
+    """Write `data` to `target` via a uniquely named sibling and a rename, so readers
+    and concurrent writers (threads or processes) only ever see a complete file."""
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; these are served to the browser
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# ----------------------------
+# Asset cache
+# ----------------------------
+class AssetCache:
+    """Holds base64-encoded file contents and published static URLs keyed on path,
+    invalidated by mtime + size. Encoded contents are the bulky part, so they live
+    in the shared size-bounded LRU; published URLs are a few bytes each.
+
+    Streamlit re-executes app.py on every interaction, but imported modules live
+    for the whole process, so one instance here is shared by every session.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._urls: dict[str, tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def b64(self, path: Path) -> str | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = ("b64", str(path.resolve()))
+        entry = SHARED.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            with self._lock:
+                self.hits += 1
+            return entry[2]
+
+        import base64  # only the inline (non-static) mode encodes anything
+
+        # Encode outside the lock; two sessions racing on a cold entry just both do the work once.
+        encoded = base64.b64encode(path.read_bytes()).decode()
+        SHARED.put(key, (st.st_mtime_ns, st.st_size, encoded), len(encoded))
+        with self._lock:
+            self.misses += 1
+        return encoded
+
+    def url(self, path: Path) -> str | None:
+        """Publish `path` under static/ with a content-hashed name and return its URL."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = str(path.resolve())
+        entry = self._urls.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            with self._lock:
+                self.hits += 1
+            return entry[2]
+
+        url = self._publish(path.read_bytes(), path.stem, path.suffix)
+        with self._lock:
+            self._urls[key] = (st.st_mtime_ns, st.st_size, url)
+            self.misses += 1
+        return url
+
+    def publish_text(self, name: str, text: str) -> str:
+        """Publish generated `text` (e.g. a chart) as static/_assets/<stem>.<hash>.<suffix>; returns its URL."""
+        # Generated text comes from a memoized builder, so it's the same str object on
+        # every rerun and the lookup never rehashes it; the entry pins the text, so it's counted
+        stem, _, suffix = name.rpartition(".")
+        return SHARED.get_or_build(
+            ("published", name, text), lambda: self._publish(text.encode(), stem, f".{suffix}"),
+            lambda url: len(url) + len(text),
+        )
+
+    @staticmethod
+    def _publish(data: bytes, stem: str, suffix: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        name = f"{stem}.{digest}{suffix}"
+        target = PUBLISHED_DIR / name
+        if not target.exists():
+            PUBLISHED_DIR.mkdir(parents=True, exist_ok=True)
+            write_atomic(target, data)
+
+        # The name changes with the content, so the URL can be cached forever.
+        # `?v=` is what makes the tornado-based static handler send a long max-age.
+        return f"{PUBLISHED_URL}/{name}?v={digest}"
+
+    def invalidate(self, path: Path | None = None):
+        with self._lock:
+            if path is None:
+                SHARED.discard(lambda k: k[0] == "b64")
+                self._urls.clear()
+            else:
+                SHARED.pop(("b64", str(path.resolve())))
+                self._urls.pop(str(path.resolve()), None)
+
+    def stats(self) -> dict:
+        encoded = SHARED.stats("b64")
+        return {
+            "entries": encoded["entries"],
+            "published": len(self._urls),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": encoded["bytes"],
+        }
+
+
+ASSET_CACHE = AssetCache()
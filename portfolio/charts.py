@@ -0,0 +1,122 @@
+"""The skills matrix as one SVG chart: a panel of bars per group, packed into columns.
+
+The SVG and its spec are built once per profile content version and kept in
+the shared LRU, so a rerun costs one lookup on a short key. With static serving it is published as a
+fingerprinted file, so a rerun sends one <img> tag however many skills there
+are and the browser caches the chart itself; otherwise it is inlined as a
+single element.
+"""
+from collections.abc import Callable
+from html import escape
+
+from portfolio.lru import SHARED
+
+WIDE_COLUMNS = 3  # matching the old three-card grid
+WIDE_WIDTH = 960
+NARROW_WIDTH = 420  # one column, used below the 900px breakpoint like the old grid
+
+_GAP = 16
+_PAD = 14
+_TITLE_H = 28
+_ROW_H = 32
+_CHAR_W = 7  # rough width of a 13px label character, for truncation
+
+# Inside an <img> the SVG can't reach the page's web fonts, so labels fall back to system-ui there
+_STYLE = (
+    '.p{fill:rgba(255,255,255,.05);stroke:rgba(255,255,255,.1)}'
+    '.t{font:800 14px "Space Grotesk",system-ui,sans-serif;fill:rgba(255,255,255,.9)}'
+    '.l{font:13px "Space Grotesk",system-ui,sans-serif;fill:rgba(255,255,255,.75)}'
+    '.k{fill:rgba(255,255,255,.1)}'
+    '.f{fill:url(#g);animation:grow 1.1s ease;transform-box:fill-box;transform-origin:left}'
+    '@keyframes grow{from{transform:scaleX(0)}}'
+    '@media (prefers-reduced-motion:reduce){.f{animation:none}}'
+)
+
+
+def _n(x: float) -> str:
+    return f"{x:.1f}".rstrip("0").rstrip(".")
+
+
+def _fit(label: str, width: float) -> str:
+    chars = max(4, int(width // _CHAR_W))
+    return label if len(label) <= chars else label[:chars - 1] + "…"
+
+
+def _panel(x: float, y: float, w: float, group: str, items) -> tuple[str, float]:
+    h = _PAD * 2 + _TITLE_H + _ROW_H * len(items)
+    inner = w - 2 * _PAD
+    parts = [
+        f'<rect class="p" x="{_n(x)}" y="{_n(y)}" width="{_n(w)}" height="{_n(h)}" rx="16"/>',
+        f'<text class="t" x="{_n(x + _PAD)}" y="{_n(y + _PAD + 16)}">{escape(_fit(group, inner))}</text>',
+    ]
+    row_y = y + _PAD + _TITLE_H
+    for label, pct in items:
+        pct = max(0, min(100, int(pct)))
+        parts.append(
+            f'<text class="l" x="{_n(x + _PAD)}" y="{_n(row_y + 13)}">{escape(_fit(label, inner - 40))}</text>'
+            f'<text class="l" x="{_n(x + w - _PAD)}" y="{_n(row_y + 13)}" text-anchor="end">{pct}%</text>'
+            f'<rect class="k" x="{_n(x + _PAD)}" y="{_n(row_y + 19)}" width="{_n(inner)}" height="8" rx="4"/>'
+        )
+        if pct:
+            parts.append(f'<rect class="f" x="{_n(x + _PAD)}" y="{_n(row_y + 19)}" width="{_n(inner * pct / 100)}" height="8" rx="4"/>')
+        row_y += _ROW_H
+    return "".join(parts), h
+
+
+def _build_svg(skill_levels, columns: int, width: int) -> tuple[str, int]:
+    col_w = (width - _GAP * (columns - 1)) / columns
+    heights = [0.0] * columns
+    panels = []
+    for group, items in skill_levels:
+        # Shortest column first, so dozens of uneven groups still pack tightly
+        col = heights.index(min(heights))
+        x = col * (col_w + _GAP)
+        svg, h = _panel(x, heights[col], col_w, group, items)
+        panels.append(svg)
+        heights[col] += h + _GAP
+    height = max(1, round(max(heights) - _GAP))
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="{width}" height="{height}">'
+        '<defs><linearGradient id="g"><stop offset="0" stop-color="#6366f1"/><stop offset="1" stop-color="#ec4899"/>'
+        f'</linearGradient></defs><style>{_STYLE}</style>{"".join(panels)}</svg>'
+    )
+    return svg, height
+
+
+def skills_svg(skill_levels, columns: int = WIDE_COLUMNS, width: int = WIDE_WIDTH) -> tuple[str, int]:
+    """(svg markup, height) for `width` px laid out in `columns`."""
+    return _build_svg(skill_levels, columns, width)
+
+
+def skills_alt(skill_levels) -> str:
+    """Short alt text; the full list of levels is rendered next to the chart (render.skills_html)."""
+    count = sum(len(items) for _, items in skill_levels)
+    return f"Skill levels chart: {count} skills in " + ", ".join(group for group, _ in skill_levels)
+
+
+def skills_chart(profile, publish_text: Callable[[str, str], str] | None = None) -> dict:
+    """Spec for render.skills_html: published URLs when `publish_text(name, text)` is given, else inline SVG."""
+    # Keyed on where it's published too, so the app and an export never share URLs
+    key = ("chart", "skills", profile.version, publish_text and publish_text.__qualname__)
+    return SHARED.get_or_build(key, lambda: _build_chart(profile.skill_levels, publish_text), _spec_size)
+
+
+def _spec_size(spec: dict) -> int:
+    return sum(len(v) for v in spec.values() if isinstance(v, str))
+
+
+def _build_chart(skill_levels, publish_text) -> dict:
+    wide, height = skills_svg(skill_levels)
+    alt = skills_alt(skill_levels)
+    if publish_text is None:
+        return {"svg": wide, "alt": alt}
+    narrow, narrow_height = skills_svg(skill_levels, columns=1, width=NARROW_WIDTH)
+    return {
+        "src": publish_text("skills.svg", wide),
+        "narrow": publish_text("skills-narrow.svg", narrow),
+        "width": WIDE_WIDTH,
+        "height": height,
+        "narrow_width": NARROW_WIDTH,
+        "narrow_height": narrow_height,
+        "alt": alt,
+    }
@@ -0,0 +1,35 @@
+"""Contact form that validates in the browser, so bad input never costs a rerun.
+
+A small custom component (frontend/contact_form/index.html, no build step)
+checks email and phone against the HTML patterns in validation.py and sends
+nothing until both pass. The server still checks everything it receives.
+
+PORTFOLIO_CONTACT_FORM=streamlit falls back to the plain st.form, e.g. for
+AppTest, which can't drive custom components.
+"""
+import os
+from functools import cache
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from portfolio.validation import EMAIL_HTML_PATTERN, PHONE_HTML_PATTERN
+
+ENABLED = os.environ.get("PORTFOLIO_CONTACT_FORM", "component") != "streamlit"
+
+
+@cache
+def _component():
+    # Declared on first use: declare_component looks up its caller's module, which costs ~20 ms at import
+    return components.declare_component("contact_form", path=str(Path(__file__).parent / "frontend" / "contact_form"))
+
+
+def contact_form(key: str = "contact_form") -> dict | None:
+    """{"email", "phone", "notes"} once per valid browser submission, else None."""
+    value = _component()(email_pattern=EMAIL_HTML_PATTERN, phone_pattern=PHONE_HTML_PATTERN, key=key, default=None)
+    # The component keeps returning its last value on later reruns
+    if not isinstance(value, dict) or value.get("nonce") == st.session_state.get(f"{key}_nonce"):
+        return None
+    st.session_state[f"{key}_nonce"] = value["nonce"]
+    return {field: str(value.get(field, "")) for field in ("email", "phone", "notes")}
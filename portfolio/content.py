@@ -0,0 +1,204 @@
+"""Portfolio content loaded from content/profile.toml into immutable, slotted models.
+
+The file is parsed and validated once; a watcher thread swaps in a new snapshot
+when it changes, so reruns only read `ContentStore.current`.
+"""
+import hashlib
+import logging
+import threading
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+
+from portfolio.singleton import process_singleton
+
+log = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATH = ROOT / "content" / "profile.toml"
+
+
+class ContentError(ValueError):
+    pass
+
+
+# ----------------------------
+# Models
+# ----------------------------
+@dataclass(frozen=True, slots=True)
+class Experience:
+    company: str
+    location: str
+    title: str
+    dates: str
+    bullets: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Education:
+    school: str
+    location: str
+    degree: str
+    dates: str
+    extra: str
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    page_title: str
+    page_icon: str
+    full_name: str
+    role: str
+    email: str
+    phone: str
+    github: str
+    photo: Path
+    resume: Path
+    pills: tuple[str, ...]
+    summary: str
+    experience: tuple[Experience, ...]
+    education: tuple[Education, ...]
+    skill_levels: tuple[tuple[str, tuple[tuple[str, int], ...]], ...]  # (group, ((skill, pct), ...))
+    coursework: tuple[str, ...]
+    contact_to: str  # where contact-form submissions go; empty means the EMAIL_TO secret
+    version: str  # hash of the source file; changes whenever the content does
+
+
+# ----------------------------
+# Parsing + validation
+# ----------------------------
+def _str(data: dict, key: str, where: str, default: str | None = None) -> str:
+    value = data.get(key, default)
+    if not isinstance(value, str):
+        raise ContentError(f"{where}: '{key}' must be a string")
+    return value
+
+
+def _strs(data: dict, key: str, where: str) -> tuple[str, ...]:
+    value = data.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ContentError(f"{where}: '{key}' must be a list of strings")
+    return tuple(value)
+
+
+def _tables(data: dict, key: str) -> list[dict]:
+    value = data.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(v, dict) for v in value):
+        raise ContentError(f"'{key}' must be an array of tables ([[{key}]])")
+    return value
+
+
+def parse(raw: bytes, base_dir: Path = ROOT) -> Profile:
+    try:
+        data = tomllib.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ContentError(str(e)) from None
+
+    skills = data.get("skills", {})
+    if not isinstance(skills, dict):
+        raise ContentError("'skills' must be a table of groups")
+    skill_levels = []
+    for group, items in skills.items():
+        if not isinstance(items, dict):
+            raise ContentError(f"skills.{group} must be a table of skill = percentage")
+        levels = []
+        for label, pct in items.items():
+            if not isinstance(pct, int) or not 0 <= pct <= 100:
+                raise ContentError(f"skills.{group}.{label} must be an integer from 0 to 100")
+            levels.append((label, pct))
+        skill_levels.append((group, tuple(levels)))
+
+    full_name = _str(data, "full_name", "profile")
+    return Profile(
+        page_title=_str(data, "page_title", "profile", full_name),
+        page_icon=_str(data, "page_icon", "profile", "👨‍💻"),
+        full_name=full_name,
+        role=_str(data, "role", "profile"),
+        email=_str(data, "email", "profile"),
+        phone=_str(data, "phone", "profile", ""),
+        github=_str(data, "github", "profile", ""),
+        photo=base_dir / _str(data, "photo", "profile", "assets/profile.jpeg"),
+        resume=base_dir / _str(data, "resume", "profile", "assets/resume.pdf"),
+        pills=_strs(data, "pills", "profile"),
+        summary=_str(data, "summary", "profile", ""),
+        experience=tuple(
+            Experience(
+                company=_str(e, "company", f"experience[{i}]"),
+                location=_str(e, "location", f"experience[{i}]", ""),
+                title=_str(e, "title", f"experience[{i}]"),
+                dates=_str(e, "dates", f"experience[{i}]", ""),
+                bullets=_strs(e, "bullets", f"experience[{i}]"),
+            )
+            for i, e in enumerate(_tables(data, "experience"))
+        ),
+        education=tuple(
+            Education(
+                school=_str(e, "school", f"education[{i}]"),
+                location=_str(e, "location", f"education[{i}]", ""),
+                degree=_str(e, "degree", f"education[{i}]"),
+                dates=_str(e, "dates", f"education[{i}]", ""),
+                extra=_str(e, "extra", f"education[{i}]", ""),
+            )
+            for i, e in enumerate(_tables(data, "education"))
+        ),
+        skill_levels=tuple(skill_levels),
+        coursework=_strs(data, "coursework", "profile"),
+        contact_to=_str(data, "contact_to", "profile", ""),
+        version=hashlib.sha1(raw).hexdigest()[:12],
+    )
+
+
+def load(path: Path) -> Profile:
+    return parse(path.read_bytes(), ROOT)
+
+
+# ----------------------------
+# Hot-reloading store
+# ----------------------------
+class ContentStore:
+    def __init__(self, path: Path = DEFAULT_PATH, poll_interval: float = 1.0):
+        self.path = path
+        self._stat = self._stat_key()
+        # Fails loudly at startup; later bad edits are logged and the last good snapshot kept
+        self.current: Profile = load(path)
+        if poll_interval > 0:
+            self._stop = threading.Event()
+            threading.Thread(target=self._watch, args=(poll_interval,), name=f"content-{path.stem}", daemon=True).start()
+
+    def _stat_key(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self) -> bool:
+        """Re-read the file if it changed; True if a new snapshot was swapped in."""
+        key = self._stat_key()
+        if key is None or key == self._stat:
+            return False
+        self._stat = key
+        try:
+            profile = load(self.path)
+        except (OSError, ContentError) as e:
+            log.error("Keeping previous content; %s is invalid: %s", self.path, e)
+            return False
+        if profile.version == self.current.version:
+            return False
+        # A single reference assignment: readers see the old or the new snapshot, never a mix
+        self.current = profile
+        log.info("Reloaded %s (version %s)", self.path, profile.version)
+        return True
+
+    def close(self):
+        if hasattr(self, "_stop"):
+            self._stop.set()
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            self.reload()
+
+
+@process_singleton
+def get_content(path: Path = DEFAULT_PATH) -> ContentStore:
+    return ContentStore(path)
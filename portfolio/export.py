@@ -0,0 +1,157 @@
+"""Export the portfolio as a self-contained static site.
+
+    python -m portfolio.export --out dist
+    python -m portfolio.export --out dist --contact-endpoint https://api.example.com/contact
+
+Renders the same sections as app.py from the same content and stylesheet into
+dist/index.html, copies every referenced asset under a content-hashed name into
+dist/assets/, and writes .gz (and .br, if the `brotli` package is installed)
+next to each compressible file so nginx `gzip_static`/`brotli_static` or a CDN
+can serve them as-is. The contact form POSTs email/phone/notes to
+--contact-endpoint when one is given; without it the form hands the message to
+the visitor's mail client (a mailto: action to the profile's contact address).
+"""
+import argparse
+import gzip
+import hashlib
+import shutil
+from html import escape
+from pathlib import Path
+
+from portfolio import charts, content, fonts, images, render, styles, validation
+
+COMPRESSIBLE = {".html", ".css", ".js", ".svg", ".json", ".txt", ".xml"}
+
+
+class Bundle:
+    def __init__(self, out: Path):
+        self.out = out
+        self.assets = out / "assets"
+        self._published: dict[Path, str] = {}
+
+    def publish(self, path: Path) -> str:
+        """Copy `path` into assets/ under a fingerprinted name; returns its URL relative to index.html."""
+        path = path.resolve()
+        if path not in self._published:
+            data = path.read_bytes()
+            name = f"{path.stem}.{hashlib.sha256(data).hexdigest()[:12]}{path.suffix}"
+            self.assets.mkdir(parents=True, exist_ok=True)
+            (self.assets / name).write_bytes(data)
+            self._published[path] = f"assets/{name}"
+        return self._published[path]
+
+    def publish_text(self, name: str, text: str) -> str:
+        stem, _, suffix = name.rpartition(".")
+        data = text.encode()
+        fingerprinted = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{suffix}"
+        self.assets.mkdir(parents=True, exist_ok=True)
+        (self.assets / fingerprinted).write_bytes(data)
+        return f"assets/{fingerprinted}"
+
+
+def precompress(root: Path) -> list[Path]:
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    written = []
+    for path in sorted(root.rglob("*")):
+        if path.suffix not in COMPRESSIBLE or not path.is_file():
+            continue
+        data = path.read_bytes()
+        gz = path.with_name(path.name + ".gz")
+        # mtime=0 keeps the output byte-identical between exports
+        gz.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(gz)
+        if brotli is not None:
+            br = path.with_name(path.name + ".br")
+            br.write_bytes(brotli.compress(data, quality=11))
+            written.append(br)
+    return written
+
+
+def contact_form(endpoint: str | None, email: str) -> str:
+    # No backend to POST to: let the visitor's mail client send it as plain text
+    action = f'action="{escape(endpoint)}"' if endpoint else f'action="mailto:{escape(email)}" enctype="text/plain"'
+    return (
+        '<div class="section-header" id="contact">Let’s get in touch 🤝</div>'
+        f'<form class="glass contact-form" method="post" {action}>'
+        '<label>Email *<input type="email" name="email" required placeholder="name@gmail.com"'
+        f' pattern="{escape(validation.EMAIL_HTML_PATTERN)}"></label>'
+        '<label>Phone number *<input type="tel" name="phone" required placeholder="+1 469 347 5994"'
+        f' pattern="{escape(validation.PHONE_HTML_PATTERN)}"></label>'
+        '<label>Message (optional)<textarea name="notes" placeholder="Tell me what you’re looking for…"></textarea></label>'
+        '<button type="submit" class="cta-link cta-primary">Submit</button>'
+        '</form>'
+    )
+
+
+STATIC_CSS = """
+body{margin:0;color:var(--text);font-family:"Space Grotesk",sans-serif}
+.stApp{min-height:100vh}
+.block-container{margin:0 auto;padding:1rem}
+.contact-form{display:grid;gap:12px;max-width:560px}
+.contact-form label{display:grid;gap:6px;font-size:14px;color:var(--muted)}
+.contact-form input,.contact-form textarea{padding:10px;border-radius:10px;border:1px solid var(--border);background:rgba(0,0,0,0.25);color:var(--text);font:inherit}
+.contact-form button{justify-self:start;cursor:pointer;font:inherit}
+"""
+
+
+def export(out: Path, profile: content.Profile, contact_endpoint: str | None = None) -> Path:
+    if out.exists():
+        if any(out.iterdir()) and not (out / "index.html").exists():
+            raise SystemExit(f"{out} is not empty and doesn't look like a previous export; refusing to overwrite it")
+        shutil.rmtree(out)
+    bundle = Bundle(out)
+
+    # Fonts live next to the stylesheet in assets/, so the CSS refers to them by file name
+    font_faces = fonts.font_face_css(lambda p: bundle.publish(p).rsplit("/", 1)[1])
+    css_url = bundle.publish_text("styles.css", styles.build_css(font_faces + styles.SOURCE.read_text() + STATIC_CSS))
+    preloads = fonts.preload_links(bundle.publish)
+
+    actions = [("GitHub", profile.github, "cta-primary")]
+    if profile.resume.exists():
+        actions.append(("Download Resume", bundle.publish(profile.resume), "cta-secondary"))
+    actions.append(("Contact", "#contact", "cta-secondary"))
+
+    body = "".join([
+        render.hero_html(profile, images.responsive_image(profile.photo, bundle.publish), actions),
+        render.summary_html(profile),
+        render.skills_html(profile, charts.skills_chart(profile, bundle.publish_text)),
+        render.timeline_html(profile),
+        render.education_html(profile),
+        render.coursework_html(profile),
+        contact_form(contact_endpoint, profile.contact_to or profile.email),
+    ])
+    page = (
+        "<!doctype html>\n"
+        '<html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{escape(profile.page_title)}</title>"
+        f'{preloads}<link rel="stylesheet" href="{css_url}">'
+        "</head><body>"
+        '<div class="stApp" data-testid="stAppViewContainer"><div class="block-container">'
+        f"{body}"
+        "</div></div></body></html>\n"
+    )
+    index = out / "index.html"
+    index.write_text(page)
+    precompress(out)
+    return index
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m portfolio.export", description="Pre-render the portfolio to static HTML.")
+    parser.add_argument("--out", type=Path, default=Path("dist"))
+    parser.add_argument("--content", type=Path, default=content.DEFAULT_PATH)
+    parser.add_argument("--contact-endpoint", help="URL the contact form POSTs to (default: a mailto: form)")
+    args = parser.parse_args(argv)
+
+    index = export(args.out, content.load(args.content), args.contact_endpoint)
+    files = [p for p in args.out.rglob("*") if p.is_file()]
+    total = sum(p.stat().st_size for p in files if p.suffix not in {".gz", ".br"})
+    print(f"{index}: {len(files)} files, {total} bytes uncompressed")
+
+
+if __name__ == "__main__":
+    main()
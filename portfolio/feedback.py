@@ -0,0 +1,180 @@
+"""Process-wide aggregation of feedback slider ratings.
+
+Recording takes one of several striped shard locks (handed out to threads
+round-robin), never a global one, so concurrent sessions rarely contend. A
+background thread periodically merges the shards and appends one JSON line with
+the new counts. The totals and the recent window are exported as gauges.
+"""
+import atexit
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from portfolio import metrics
+from portfolio.singleton import process_singleton
+
+log = logging.getLogger(__name__)
+
+RATINGS = (1, 2, 3, 4, 5)
+DEFAULT_PATH = Path(os.environ.get("PORTFOLIO_FEEDBACK_LOG", Path(__file__).resolve().parent.parent / "data" / "feedback.jsonl"))
+
+
+class _Shard:
+    __slots__ = ("lock", "pending", "window")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = [0] * len(RATINGS)  # counts not yet flushed to disk
+        self.window: dict[int, list[int]] = {}  # time bucket -> counts
+
+
+class FeedbackAggregator:
+    def __init__(self, path: Path | None = DEFAULT_PATH, shards: int = 16, bucket_seconds: int = 60,
+                 window_buckets: int = 60, flush_interval: float = 30.0):
+        self.path = Path(path) if path else None
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self._shards = [_Shard() for _ in range(shards)]
+        # Thread idents are aligned addresses, so `ident % shards` lands on one
+        # shard; give each thread the next shard on its first record instead
+        self._shard_of = threading.local()
+        self._next_shard = itertools.count()
+        self._flushed = [0] * len(RATINGS)  # counts already on disk (loaded or flushed)
+        self._flush_lock = threading.Lock()
+        self._load()
+        if self.path and flush_interval > 0:
+            self._stop = threading.Event()
+            threading.Thread(target=self._run, args=(flush_interval,), name="feedback-flush", daemon=True).start()
+
+    # ----------------------------
+    # Hot path
+    # ----------------------------
+    def record(self, rating: int, now: float | None = None):
+        i = RATINGS.index(rating)
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        shard = getattr(self._shard_of, "shard", None)
+        if shard is None:
+            shard = self._shard_of.shard = self._shards[next(self._next_shard) % len(self._shards)]
+        with shard.lock:
+            shard.pending[i] += 1
+            counts = shard.window.get(bucket)
+            if counts is None:
+                counts = shard.window[bucket] = [0] * len(RATINGS)
+                # A new bucket is the moment to trim this shard's old ones
+                for old in [b for b in shard.window if b <= bucket - self.window_buckets]:
+                    del shard.window[old]
+            counts[i] += 1
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+    def summary(self, now: float | None = None) -> dict:
+        oldest = int((time.time() if now is None else now) // self.bucket_seconds) - self.window_buckets + 1
+        totals = list(self._flushed)
+        window = [0] * len(RATINGS)
+        for shard in self._shards:
+            with shard.lock:
+                for i, p in enumerate(shard.pending):
+                    totals[i] += p
+                for bucket, counts in shard.window.items():
+                    if bucket >= oldest:
+                        for i, c in enumerate(counts):
+                            window[i] += c
+        return {
+            **_stats(totals),
+            "window": {"seconds": self.bucket_seconds * self.window_buckets, **_stats(window)},
+        }
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def flush(self) -> dict[str, int] | None:
+        """Append counts recorded since the last flush as one JSON line.
+
+        If the write fails the counts go back to pending for the next flush, and the OSError propagates.
+        """
+        with self._flush_lock:
+            delta = [0] * len(RATINGS)
+            for shard in self._shards:
+                with shard.lock:
+                    pending, shard.pending = shard.pending, [0] * len(RATINGS)
+                for i, p in enumerate(pending):
+                    delta[i] += p
+            if not any(delta):
+                return None
+            counts = {str(r): c for r, c in zip(RATINGS, delta) if c}
+            if self.path:
+                try:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with self.path.open("a") as f:
+                        f.write(json.dumps({"ts": int(time.time()), "counts": counts}) + "\n")
+                except OSError:
+                    shard = self._shards[0]
+                    with shard.lock:
+                        for i, c in enumerate(delta):
+                            shard.pending[i] += c
+                    raise
+            for i, c in enumerate(delta):
+                self._flushed[i] += c
+            return counts
+
+    def close(self):
+        if hasattr(self, "_stop"):
+            self._stop.set()
+        try:
+            self.flush()
+        except OSError as e:
+            log.error("Lost unsaved feedback counts: could not write %s: %s", self.path, e)
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        with self.path.open() as f:
+            for line in f:
+                try:
+                    counts = json.loads(line)["counts"]
+                except (ValueError, KeyError):
+                    continue  # a torn last line from a crash
+                for r, c in counts.items():
+                    self._flushed[RATINGS.index(int(r))] += c
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except OSError as e:
+                # e.g. a full disk or read-only data/: keep the counts and try again next interval
+                log.warning("Could not save feedback to %s: %s", self.path, e)
+
+
+def _stats(counts: list[int]) -> dict:
+    total = sum(counts)
+    mean = sum(r * c for r, c in zip(RATINGS, counts)) / total if total else None
+    return {"total": total, "mean": mean, "counts": dict(zip(RATINGS, counts))}
+
+
+@process_singleton
+def get_aggregator() -> FeedbackAggregator:
+    aggregator = FeedbackAggregator()
+    # Counts still pending at shutdown would otherwise be lost
+    atexit.register(aggregator.close)
+    return aggregator
+
+
+def _rating_counts(window: bool) -> dict:
+    aggregator = get_aggregator.instances.get(())
+    if aggregator is None:
+        return {}
+    summary = aggregator.summary()
+    counts = summary["window"]["counts"] if window else summary["counts"]
+    return {(("rating", str(r)),): c for r, c in counts.items()}
+
+
+metrics.gauge("portfolio_feedback_ratings", "Feedback ratings recorded, including earlier runs",
+              lambda: _rating_counts(window=False))
+metrics.gauge("portfolio_feedback_window_ratings", "Feedback ratings recorded in the recent window",
+              lambda: _rating_counts(window=True))
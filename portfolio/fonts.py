@@ -0,0 +1,173 @@
+"""Self-hosted web fonts: vendor, subset and serve Space Grotesk + Playfair Display.
+
+    python -m portfolio.fonts fetch   # download the OFL sources into assets/fonts/src (needs network, once)
+    python -m portfolio.fonts build   # subset to the page's glyphs -> assets/fonts/*.woff2 + fonts.json
+
+Both source and built files are meant to be committed, so air-gapped
+deployments never reach out to Google Fonts. Until they are, the stylesheet
+keeps importing the families from fonts.googleapis.com. Building needs
+`fonttools` and `brotli` (pip install fonttools brotli); serving needs nothing extra.
+"""
+import json
+import string
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FONTS_DIR = ROOT / "assets" / "fonts"
+SRC_DIR = FONTS_DIR / "src"
+MANIFEST = FONTS_DIR / "fonts.json"
+
+_GOOGLE_FONTS = "https://github.com/google/fonts/raw/main/ofl"
+FAMILIES = {
+    "Space Grotesk": {"source": "SpaceGrotesk[wght].ttf", "url": f"{_GOOGLE_FONTS}/spacegrotesk"},
+    "Playfair Display": {"source": "PlayfairDisplay[wght].ttf", "url": f"{_GOOGLE_FONTS}/playfairdisplay"},
+}
+
+# Served only while no subset is built
+GOOGLE_IMPORT = (
+    "@import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;600;700"
+    "&family=Playfair+Display:wght@600;700&display=swap');"
+)
+
+# Files whose text ends up on the page; everything they contain is kept in the subset
+TEXT_SOURCES = [ROOT / "content" / "profile.toml", ROOT / "app.py", ROOT / "portfolio" / "render.py"]
+# Always kept, so content added after the build (a new profile, a repo description)
+# still renders in the web font: Latin-1, Latin Extended-A and general punctuation
+LATIN_RANGES = ((0x20, 0x7E), (0xA0, 0x17F), (0x2010, 0x2027), (0x2030, 0x203A), (0x20AC, 0x20AC), (0x2122, 0x2122))
+
+
+# ----------------------------
+# Serving
+# ----------------------------
+def manifest() -> list[dict]:
+    """Built fonts per fonts.json; parsed once per version of the file."""
+    try:
+        mtime = MANIFEST.stat().st_mtime_ns
+    except OSError:
+        return []
+    return _read_manifest(mtime)
+
+
+@lru_cache(maxsize=1)
+def _read_manifest(mtime_ns: int) -> list[dict]:
+    return json.loads(MANIFEST.read_text())
+
+
+def font_files() -> list[Path]:
+    return [FONTS_DIR / entry["file"] for entry in manifest()]
+
+
+def font_face_css(url_for: Callable[[Path], str]) -> str:
+    """@font-face rules for every built font; the Google Fonts @import if none are built."""
+    entries = manifest()
+    if not entries:
+        return GOOGLE_IMPORT
+    rules = []
+    for entry in entries:
+        rules.append(
+            "@font-face{"
+            f'font-family:"{entry["family"]}";'
+            f'src:url({url_for(FONTS_DIR / entry["file"])}) format("woff2");'
+            f'font-weight:{entry["weight"]};font-style:normal;font-display:swap'
+            "}"
+        )
+    return "".join(rules)
+
+
+def preload_links(url_for: Callable[[Path], str]) -> str:
+    """<link rel=preload> tags for the built fonts; only useful inside <head> (the static export)."""
+    return "".join(
+        f'<link rel="preload" href="{url_for(path)}" as="font" type="font/woff2" crossorigin>'
+        for path in font_files()
+    )
+
+
+# ----------------------------
+# Pipeline
+# ----------------------------
+def fetch():
+    import urllib.request
+
+    SRC_DIR.mkdir(parents=True, exist_ok=True)
+    for family, spec in FAMILIES.items():
+        stem = spec["source"].split("[")[0]
+        for name, target in ((spec["source"], spec["source"]), ("OFL.txt", f"{stem}-OFL.txt")):
+            url = f"{spec['url']}/{urllib.request.quote(name)}"
+            print(f"{family}: {url}")
+            with urllib.request.urlopen(url, timeout=30) as resp:
+                (SRC_DIR / target).write_bytes(resp.read())
+
+
+def _github_text() -> str:
+    from portfolio.github import SNAPSHOT_DIR
+
+    text = []
+    for path in SNAPSHOT_DIR.glob("*.json"):
+        try:
+            text += [r.get("name", "") + r.get("description", "") + r.get("language", "")
+                     for r in json.loads(path.read_text())["repos"]]
+        except (OSError, ValueError, KeyError, AttributeError):
+            continue
+    return "".join(text)
+
+
+def used_text() -> str:
+    from portfolio.profiles import PROFILES_DIR
+
+    sources = [*TEXT_SOURCES, *sorted(PROFILES_DIR.glob("*.toml"))]
+    text = "".join(p.read_text(encoding="utf-8") for p in sources if p.exists()) + _github_text()
+    latin = {chr(c) for lo, hi in LATIN_RANGES for c in range(lo, hi + 1)}
+    chars = (set(text) | latin | set(string.printable)) - set(string.whitespace)
+    return "".join(sorted(chars | {" ", "\u00a0"}))
+
+
+def build():
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        raise SystemExit("Building fonts needs fonttools and brotli: pip install fonttools brotli")
+
+    text = used_text()
+    entries = []
+    for family, spec in FAMILIES.items():
+        src = SRC_DIR / spec["source"]
+        if not src.exists():
+            raise SystemExit(f"Missing {src.relative_to(ROOT)}; run `python -m portfolio.fonts fetch` first")
+        font = TTFont(src)
+        options = subset.Options()
+        options.flavor = "woff2"
+        options.layout_features = ["kern", "liga", "calt"]
+        options.name_IDs = ["*"]  # keep copyright/licence strings
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+
+        out = FONTS_DIR / f"{src.stem.split('[')[0]}-subset.woff2"
+        font.flavor = "woff2"
+        font.save(out)
+
+        if "fvar" in font:
+            axis = next(a for a in font["fvar"].axes if a.axisTag == "wght")
+            weight = f"{int(axis.minValue)} {int(axis.maxValue)}"
+        else:
+            weight = str(font["OS/2"].usWeightClass)
+        entries.append({"family": family, "file": out.name, "weight": weight})
+        print(f"{out.relative_to(ROOT)}: {out.stat().st_size} bytes ({src.stat().st_size} source), {len(text)} glyphs requested")
+
+    MANIFEST.write_text(json.dumps(entries, indent=2) + "\n")
+
+
+def main(argv: list[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m portfolio.fonts", description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("fetch", "build"))
+    args = parser.parse_args(argv)
+    fetch() if args.command == "fetch" else build()
+
+
+if __name__ == "__main__":
+    main()
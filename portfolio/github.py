@@ -0,0 +1,184 @@
+"""Public GitHub repos for the projects section, fetched without ever blocking a rerun.
+
+One feed per GitHub user, shared by every session. A rerun only reads the
+current snapshot; once it is older than `ttl` a daemon thread revalidates it
+with If-None-Match (a 304 costs no rate limit), while the stale copy keeps
+being served. The last good snapshot is written to data/github/, so a restart
+or an API outage still shows the section.
+
+PORTFOLIO_GITHUB_API points at another base URL (e.g. a local stub) and
+PORTFOLIO_GITHUB_TOKEN raises the unauthenticated limit of 60 requests/hour.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+from portfolio import metrics
+from portfolio.assets import write_atomic
+from portfolio.content import ROOT
+from portfolio.singleton import process_singleton
+
+log = logging.getLogger(__name__)
+
+API_URL = os.environ.get("PORTFOLIO_GITHUB_API", "https://api.github.com").rstrip("/")
+TOKEN = os.environ.get("PORTFOLIO_GITHUB_TOKEN", "")
+SNAPSHOT_DIR = Path(os.environ.get("PORTFOLIO_GITHUB_CACHE", ROOT / "data" / "github"))
+
+REQUESTS = metrics.counter("portfolio_github_requests_total", "GitHub API requests by result")
+
+
+@dataclass(frozen=True, slots=True)
+class Repo:
+    name: str
+    url: str
+    description: str
+    language: str
+    stars: int
+    forks: int
+    pushed_at: str
+
+
+def username(url: str) -> str | None:
+    """The user in a github.com profile URL like https://github.com/mbalisetti; None for anything else."""
+    parsed = urlparse(url)
+    parts = [p for p in parsed.path.split("/") if p]
+    if parsed.hostname not in ("github.com", "www.github.com") or len(parts) != 1:
+        return None
+    return parts[0]
+
+
+def _parse(payload: list[dict], limit: int) -> tuple[Repo, ...]:
+    """Raises ValueError for a payload that isn't the expected list of repo objects."""
+    if not isinstance(payload, list):
+        raise ValueError(f"expected a list of repos, got {type(payload).__name__}")
+    # The REST API has no "pinned" list (that is GraphQL-only), so show the
+    # owner's most starred non-fork repos instead
+    try:
+        repos = [
+            Repo(
+                name=r["name"],
+                url=r["html_url"],
+                description=r.get("description") or "",
+                language=r.get("language") or "",
+                stars=int(r.get("stargazers_count", 0)),
+                forks=int(r.get("forks_count", 0)),
+                pushed_at=r.get("pushed_at") or "",
+            )
+            for r in payload
+            if not r.get("fork") and not r.get("archived")
+        ]
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"unexpected repo object: {e!r}") from e
+    repos.sort(key=lambda r: (r.stars, r.pushed_at), reverse=True)
+    return tuple(repos[:limit])
+
+
+class RepoFeed:
+    def __init__(self, user: str, api_url: str = API_URL, ttl: float = 900.0, retry: float = 120.0,
+                 limit: int = 6, timeout: float = 5.0, snapshot_dir: Path = SNAPSHOT_DIR):
+        self.user = user
+        self.api_url = api_url
+        self.ttl = ttl
+        self.retry = retry  # wait this long after a failed refresh
+        self.limit = limit
+        self.timeout = timeout
+        self.path = snapshot_dir / f"{user}.json"
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.snapshot: tuple[str, tuple[Repo, ...]] = ("", ())  # (hash of the repos, repos)
+        self.etag = ""
+        self.fetched = 0.0  # wall clock of the last successful check
+        self._next_check = 0.0  # monotonic
+        self._load_snapshot()
+
+    def get(self) -> tuple[str, tuple[Repo, ...]]:
+        """(version, repos) as of the last refresh, possibly stale; schedules a background refresh when due."""
+        if time.monotonic() >= self._next_check:
+            with self._lock:
+                start = not self._refreshing and time.monotonic() >= self._next_check
+                self._refreshing = self._refreshing or start
+            if start:
+                threading.Thread(target=self._refresh, name=f"github-{self.user}", daemon=True).start()
+        return self.snapshot
+
+    @property
+    def repos(self) -> tuple[Repo, ...]:
+        return self.snapshot[1]
+
+    def _swap(self, repos: tuple[Repo, ...]):
+        blob = json.dumps([asdict(r) for r in repos], sort_keys=True)
+        # One reference assignment, so readers never see a version paired with the wrong repos
+        self.snapshot = (hashlib.sha1(blob.encode()).hexdigest()[:12], repos)
+
+    def _load_snapshot(self):
+        try:
+            data = json.loads(self.path.read_text())
+            self._swap(tuple(Repo(**r) for r in data["repos"]))
+            self.etag = data.get("etag", "")
+            self.fetched = float(data.get("fetched", 0))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            log.warning("Ignoring unreadable GitHub snapshot %s: %s", self.path, e)
+            return
+        # Still fresh after a restart? Don't spend a request on it
+        age = time.time() - self.fetched
+        self._next_check = time.monotonic() + max(0.0, self.ttl - age)
+
+    def _save_snapshot(self):
+        data = {"etag": self.etag, "fetched": self.fetched, "repos": [asdict(r) for r in self.repos]}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, json.dumps(data, indent=1).encode())
+        except OSError as e:
+            log.warning("Could not save GitHub snapshot %s: %s", self.path, e)
+
+    def _refresh(self):
+        import urllib.error
+        import urllib.request
+
+        url = f"{self.api_url}/users/{self.user}/repos?type=owner&sort=pushed&per_page=100"
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if self.etag and self.repos:
+            headers["If-None-Match"] = self.etag
+        if TOKEN:
+            headers["Authorization"] = f"Bearer {TOKEN}"
+        next_check = self.retry
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout) as resp:
+                payload = json.load(resp)
+                etag = resp.headers.get("ETag", "")
+            self._swap(_parse(payload, self.limit))
+            self.etag = etag
+            self.fetched = time.time()
+            self._save_snapshot()
+            REQUESTS.inc(result="ok")
+            next_check = self.ttl
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                self.fetched = time.time()
+                self._save_snapshot()
+                REQUESTS.inc(result="not_modified")
+                next_check = self.ttl
+            else:
+                REQUESTS.inc(result="error")
+                log.warning("GitHub refresh for %s failed: HTTP %d", self.user, e.code)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            REQUESTS.inc(result="error")
+            log.warning("GitHub refresh for %s failed: %s", self.user, e)
+        finally:
+            with self._lock:
+                self._next_check = time.monotonic() + next_check
+                self._refreshing = False
+
+
+@process_singleton
+def get_feed(user: str) -> RepoFeed:
+    """One feed per user, shared by every profile that links to them."""
+    return RepoFeed(user)
@@ -0,0 +1,170 @@
+"""Responsive variants of the hero photo: 1x/2x/3x AVIF, WebP and JPEG plus a tiny placeholder.
+
+Variants are generated once per source image (keyed on its content hash) into
+build/images/, and reused across sessions and restarts.
+
+    python -m portfolio.images assets/profile.jpeg
+"""
+import base64
+import hashlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / "build" / "images"
+
+# Matches .profile-img in assets/styles.css
+DISPLAY_SIZE = (210, 220)
+DENSITIES = (1, 2, 3)
+FORMATS = [
+    # (extension, PIL format, mime, save options)
+    ("avif", "AVIF", "image/avif", {"quality": 50}),
+    ("webp", "WEBP", "image/webp", {"quality": 78, "method": 6}),
+    ("jpg", "JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+]
+PLACEHOLDER_WIDTH = 16
+
+
+def _formats() -> list[tuple]:
+    from PIL import features
+
+    # AVIF needs a Pillow built with libavif (>= 11.2); skip it rather than fail
+    return [f for f in FORMATS if f[1] != "AVIF" or features.check("avif")]
+
+
+def _generate(src: Path, out_dir: Path) -> dict:
+    # Pillow costs ~20 ms to import; only pay it when variants actually need (re)building
+    from PIL import Image, ImageFilter, ImageOps
+
+    image = ImageOps.exif_transpose(Image.open(src)).convert("RGB")
+    w, h = DISPLAY_SIZE
+    variants: dict[str, list[tuple[int, str]]] = {}
+    for density in DENSITIES:
+        size = (w * density, h * density)
+        if density > 1 and (image.width < size[0] or image.height < size[1]):
+            break  # never upscale; the browser does that better
+        # object-fit: cover, done ahead of time
+        fitted = ImageOps.fit(image, size, Image.LANCZOS)
+        for ext, fmt, mime, options in _formats():
+            name = f"{src.stem}-{size[0]}w.{ext}"
+            fitted.save(out_dir / name, fmt, **options)
+            variants.setdefault(mime, []).append((density, name))
+
+    tiny = ImageOps.fit(image, (PLACEHOLDER_WIDTH, round(PLACEHOLDER_WIDTH * h / w)), Image.LANCZOS)
+    buf = io.BytesIO()
+    tiny.filter(ImageFilter.GaussianBlur(1)).save(buf, "WEBP", quality=30)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode()
+
+    manifest = {"variants": variants, "placeholder": placeholder}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+# ----------------------------
+# Cached lookup
+# ----------------------------
+_lock = threading.Lock()
+_sets: dict[str, tuple[int, int, Path, dict]] = {}
+
+
+def variants(src: Path) -> tuple[Path, dict] | None:
+    """(directory, manifest) for `src`, generating the variants if needed."""
+    try:
+        st = src.stat()
+    except OSError:
+        return None
+    key = str(src.resolve())
+    entry = _sets.get(key)
+    if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+        return entry[2], entry[3]
+
+    with _lock:
+        digest = hashlib.sha256(src.read_bytes()).hexdigest()[:16]
+        out_dir = CACHE_DIR / digest
+        manifest_path = out_dir / "manifest.json"
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+        else:
+            # A private build dir per attempt: other processes may be building the same digest
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = Path(tempfile.mkdtemp(dir=CACHE_DIR, prefix=f".{digest}.", suffix=".tmp"))
+            try:
+                manifest = _generate(src, tmp)
+                tmp.chmod(0o755)  # mkdtemp creates 0700
+                tmp.replace(out_dir)
+            except OSError:
+                if not manifest_path.exists():
+                    raise
+            finally:
+                # Gone if the rename won; otherwise another process got there first with identical output
+                shutil.rmtree(tmp, ignore_errors=True)
+        _sets[key] = (st.st_mtime_ns, st.st_size, out_dir, manifest)
+    return out_dir, manifest
+
+
+def _spec_key(src: Path, kind: str, fn: Callable) -> str:
+    # What the spec is built from, so consumers can memoize on it without hashing
+    # the (possibly data: URI sized) spec itself
+    return f"{kind}:{getattr(fn, '__qualname__', fn)}:{src.resolve()}:{src.stat().st_mtime_ns}"
+
+
+def responsive_image(src: Path, url_for: Callable[[Path], str]) -> dict | None:
+    """Image spec for render.hero_html: per-format srcsets, a JPEG fallback and a placeholder."""
+    found = variants(src)
+    if found is None:
+        return None
+    out_dir, manifest = found
+    srcsets = {
+        mime: ", ".join(f"{url_for(out_dir / name)} {density}x" for density, name in items)
+        for mime, items in manifest["variants"].items()
+    }
+    fallback = manifest["variants"]["image/jpeg"][0][1]
+    return {
+        "key": _spec_key(src, "responsive", url_for),
+        "src": url_for(out_dir / fallback),
+        # Best format first; the JPEG srcset goes on the <img> itself
+        "sources": [[mime, srcset] for mime, srcset in srcsets.items() if mime != "image/jpeg"],
+        "srcset": srcsets["image/jpeg"],
+        "placeholder": manifest["placeholder"],
+        "width": DISPLAY_SIZE[0],
+        "height": DISPLAY_SIZE[1],
+    }
+
+
+def inline_image(src: Path, encode: Callable[[Path], str | None]) -> dict | None:
+    """Single-variant spec for when nothing can be served statically: the 2x WebP as a data URI."""
+    found = variants(src)
+    if found is None:
+        return None
+    out_dir, manifest = found
+    webp = manifest["variants"].get("image/webp") or manifest["variants"]["image/jpeg"]
+    density, name = webp[min(1, len(webp) - 1)]
+    mime = "image/webp" if name.endswith(".webp") else "image/jpeg"
+    return {
+        "key": _spec_key(src, "inline", encode),
+        "src": f"data:{mime};base64,{encode(out_dir / name)}",
+        "placeholder": manifest["placeholder"],
+        "width": DISPLAY_SIZE[0],
+        "height": DISPLAY_SIZE[1],
+    }
+
+
+def main():
+    for arg in sys.argv[1:] or ["assets/profile.jpeg"]:
+        src = Path(arg)
+        out_dir, manifest = variants(src)
+        print(f"{src} ({src.stat().st_size} bytes) -> {out_dir.relative_to(ROOT)}")
+        for mime, items in manifest["variants"].items():
+            for density, name in items:
+                print(f"  {density}x {mime:<11} {(out_dir / name).stat().st_size:>7} bytes  {name}")
+        print(f"  placeholder {len(manifest['placeholder'])} bytes")
+
+
+if __name__ == "__main__":
+    main()
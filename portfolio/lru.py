@@ -0,0 +1,117 @@
+"""A thread-safe LRU cache bounded by an estimate of the memory its values hold.
+
+One instance, SHARED, backs every per-profile cache (content models, encoded
+assets, compiled HTML), so a process serving hundreds of profiles keeps only
+the recently viewed ones resident, within PORTFOLIO_CACHE_MB.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable
+
+
+def sizeof(obj, _seen: set | None = None) -> int:
+    """Rough deep size in bytes: containers, dataclass/slotted objects and their contents."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(sizeof(k, seen) + sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(sizeof(v, seen) for v in obj)
+    slots = getattr(type(obj), "__slots__", ())
+    size += sum(sizeof(getattr(obj, name), seen) for name in slots if hasattr(obj, name))
+    if hasattr(obj, "__dict__"):
+        size += sizeof(vars(obj), seen)
+    return size
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, max_bytes: int, max_entries: int | None = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value, size: int | None = None):
+        size = sizeof(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes or (self.max_entries and len(self._entries) > self.max_entries):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def get_or_build(self, key: Hashable, build: Callable[[], object], size: Callable[[object], int] | None = None):
+        """Cached value for `key`, building it outside the lock on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(key, value, size(value) if size else None)
+        return value
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+            return None if entry is None else entry[0]
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches; returns how many went."""
+        with self._lock:
+            doomed = [k for k in self._entries if predicate(k)]
+            for key in doomed:
+                self.bytes -= self._entries.pop(key)[1]
+        return len(doomed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self, namespace: str | None = None) -> dict:
+        """Totals, or just the entries whose key is a tuple starting with `namespace`."""
+        with self._lock:
+            if namespace is None:
+                entries, nbytes = len(self._entries), self.bytes
+            else:
+                sizes = [s for k, (_, s) in self._entries.items() if isinstance(k, tuple) and k and k[0] == namespace]
+                entries, nbytes = len(sizes), sum(sizes)
+            return {
+                "entries": entries,
+                "bytes": nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+SHARED = LRUCache(max_bytes=int(float(os.environ.get("PORTFOLIO_CACHE_MB", "256")) * 1024 * 1024))
@@ -0,0 +1,276 @@
+"""Process-wide counters and fixed-bucket histograms, exported in Prometheus text format.
+
+Off unless PORTFOLIO_METRICS=1. When off, `timed()` hands back a shared no-op
+context manager and `inc`/`observe` return on their first line, so leaving the
+instrumentation in the hot path costs next to nothing.
+
+    PORTFOLIO_METRICS=1                 # collect, and serve http://127.0.0.1:9464/metrics
+    PORTFOLIO_METRICS_PORT=9464         # 0 disables the endpoint (metrics are still collected)
+    PORTFOLIO_METRICS_LOG=1             # also write one JSON line per rerun with its section timings to stderr
+"""
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager, nullcontext
+
+log = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("PORTFOLIO_METRICS", "").lower() in ("1", "true", "yes")
+LOG_RERUNS = os.environ.get("PORTFOLIO_METRICS_LOG", "").lower() in ("1", "true", "yes")
+PORT = int(os.environ.get("PORTFOLIO_METRICS_PORT", "9464"))
+
+if LOG_RERUNS:
+    # Streamlit only configures its own loggers, so INFO from here would go nowhere
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+# Seconds; covers a cached section lookup (sub-ms) up to a slow SMTP handshake
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+# ----------------------------
+# Metric types
+# ----------------------------
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not ENABLED:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, "", value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (last one is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not ENABLED:
+            return
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", key, f'le="{bound}"', cumulative
+            yield f"{self.name}_sum", key, "", total
+            yield f"{self.name}_count", key, "", cumulative
+
+
+class Gauge:
+    """Read at scrape time from `fn`, which returns {labels-tuple: value} or a single number."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float | dict]):
+        self.name = name
+        self.help = help
+        self.fn = fn
+
+    def samples(self):
+        try:
+            value = self.fn()
+        except Exception:
+            log.exception("Gauge %s failed", self.name)
+            return
+        if isinstance(value, dict):
+            for key, v in value.items():
+                yield self.name, key, "", v
+        else:
+            yield self.name, (), "", value
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+_registry: dict[str, Counter | Histogram | Gauge] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        # Streamlit re-executes app.py per rerun; hand back the existing metric
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, help: str) -> Counter:
+    return _registry.get(name) or _register(Counter(name, help))
+
+
+def histogram(name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    return _registry.get(name) or _register(Histogram(name, help, buckets))
+
+
+def gauge(name: str, help: str, fn: Callable[[], float | dict]) -> Gauge:
+    """Register (or replace) a gauge computed on scrape."""
+    with _registry_lock:
+        metric = _registry[name] = Gauge(name, help, fn)
+    return metric
+
+
+def exposition() -> str:
+    """All metrics in Prometheus text format (version 0.0.4)."""
+    lines = []
+    for metric in sorted(_registry.values(), key=lambda m: m.name):
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, key, extra, value in metric.samples():
+            lines.append(f"{name}{_format_labels(key, extra)} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------
+# Hot-path helpers
+# ----------------------------
+SECTION_SECONDS = histogram("portfolio_section_seconds", "Time spent rendering each section of app.py")
+RERUN_SECONDS = histogram("portfolio_rerun_seconds", "Time spent executing app.py top to bottom")
+RERUNS = counter("portfolio_reruns_total", "Full-script reruns of app.py")
+
+# Per-thread (= per script run) section timings for the rerun log line
+_current = threading.local()
+
+
+@contextmanager
+def _timed(section: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        SECTION_SECONDS.observe(elapsed, section=section)
+        sections = getattr(_current, "sections", None)
+        if sections is not None:
+            sections[section] = sections.get(section, 0.0) + elapsed
+
+
+def timed(section: str):
+    """Time a block into portfolio_section_seconds{section=...}; a no-op when metrics are off."""
+    if not ENABLED:
+        return _NOOP
+    return _timed(section)
+
+
+def begin_rerun():
+    if not ENABLED:
+        return
+    _current.started = time.perf_counter()
+    _current.sections = {}
+    start_server()
+
+
+def end_rerun(**fields):
+    """Close the rerun opened by begin_rerun(); `fields` are added to the log line."""
+    if not ENABLED or getattr(_current, "started", None) is None:
+        return
+    elapsed = time.perf_counter() - _current.started
+    RERUNS.inc()
+    RERUN_SECONDS.observe(elapsed)
+    if LOG_RERUNS:
+        log.info(json.dumps({
+            "event": "rerun",
+            "ms": round(elapsed * 1000, 3),
+            "sections": {k: round(v * 1000, 3) for k, v in _current.sections.items()},
+            **fields,
+        }))
+    _current.started = _current.sections = None
+
+
+# ----------------------------
+# Endpoint
+# ----------------------------
+_server = None  # http.server.ThreadingHTTPServer, imported only when metrics are on
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_server(host: str = "127.0.0.1", port: int = PORT):
+    """Serve /metrics on a daemon thread, once per process; None if disabled or the port is taken."""
+    global _server, _server_failed
+    if _server is not None or _server_failed or not ENABLED or not port:
+        return _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = exposition().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would drown the app log
+
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, port), Handler)
+            except OSError as e:
+                # e.g. a second worker process on the same host; don't retry on every rerun
+                _server_failed = True
+                log.warning("Metrics endpoint not started on %s:%d: %s", host, port, e)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+            log.info("Serving metrics on http://%s:%d/metrics", host, port)
+    return _server
@@ -0,0 +1,384 @@
+"""Background delivery of contact emails over a kept-alive SMTP connection.
+
+Submissions are queued and acknowledged immediately; a single worker thread per
+SMTP configuration drains the queue, reusing one connection between messages
+and retrying failures with exponential backoff.
+
+With digest mode on (CONTACT_DIGEST_SECONDS in secrets), submissions are
+instead collected for up to that many seconds, or CONTACT_DIGEST_MAX of them,
+and the owner gets one summary email per batch. Each submitter's copy
+(CONTACT_DIGEST_COPIES, on by default) goes out over the same connection.
+"""
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from portfolio import metrics
+from portfolio.singleton import process_singleton
+
+# smtplib and the email package are only needed once someone submits the form
+if TYPE_CHECKING:
+    import smtplib
+    from email.message import EmailMessage
+
+log = logging.getLogger(__name__)
+
+
+# ----------------------------
+# Config
+# ----------------------------
+@dataclass(frozen=True)
+class SMTPConfig:
+    host: str = "smtp.gmail.com"
+    port: int = 465
+    tls: str = "ssl"  # "ssl" (implicit TLS), "starttls" or "none" (e.g. a local aiosmtpd)
+    username: str | None = None
+    password: str | None = None
+    timeout: float = 10.0
+    idle_timeout: float = 60.0  # close the pooled connection after this long without mail
+
+    @classmethod
+    def from_secrets(cls, secrets) -> "SMTPConfig":
+        return cls(
+            host=secrets.get("SMTP_HOST", cls.host),
+            port=int(secrets.get("SMTP_PORT", cls.port)),
+            tls=secrets.get("SMTP_TLS", cls.tls),
+            username=secrets.get("SMTP_USERNAME", secrets.get("EMAIL_FROM")),
+            password=secrets.get("SMTP_PASSWORD", secrets.get("GMAIL_APP_PASSWORD")),
+        )
+
+
+@dataclass(frozen=True)
+class DigestConfig:
+    window: float = 0.0  # seconds to collect submissions for; 0 sends each one on its own
+    max_items: int = 25  # send early once this many are waiting
+    copies: bool = True  # still send each submitter a copy of what they sent
+
+    @classmethod
+    def from_secrets(cls, secrets) -> "DigestConfig":
+        return cls(
+            window=float(secrets.get("CONTACT_DIGEST_SECONDS", cls.window)),
+            max_items=int(secrets.get("CONTACT_DIGEST_MAX", cls.max_items)),
+            copies=str(secrets.get("CONTACT_DIGEST_COPIES", cls.copies)).lower() not in ("false", "0", "no"),
+        )
+
+
+@dataclass(frozen=True)
+class Contact:
+    to_email: str
+    from_email: str
+    user_email: str
+    user_phone: str
+    notes: str
+    received: float = 0.0  # time.time() when submitted
+
+
+def build_contact_message(to_email: str, from_email: str, user_email: str, user_phone: str, notes: str) -> "EmailMessage":
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    msg["Subject"] = "New Portfolio Contact Submission"
+    msg["From"] = from_email
+    msg["To"] = to_email
+
+    # Optional: CC the user (recommended UX)
+    # If you don't want user to get a copy, comment the next line.
+    msg["Cc"] = user_email
+
+    body = f"""
+New contact submitted from your portfolio:
+
+User Email: {user_email}
+User Phone: {user_phone}
+Message: {notes if notes else "(no message)"}
+"""
+    msg.set_content(body)
+    return msg
+
+
+def build_copy_message(contact: Contact) -> "EmailMessage":
+    """The submitter's own copy, sent separately when the owner gets a digest."""
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    msg["Subject"] = "Your Portfolio Contact Submission"
+    msg["From"] = contact.from_email
+    msg["To"] = contact.user_email
+    msg.set_content(f"""
+Thanks for getting in touch. This is what you sent:
+
+Email: {contact.user_email}
+Phone: {contact.user_phone}
+Message: {contact.notes if contact.notes else "(no message)"}
+""")
+    return msg
+
+
+def build_digest_message(contacts: list[Contact]) -> "EmailMessage":
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    count = len(contacts)
+    msg["Subject"] = f"{count} New Portfolio Contact Submission{'s' if count > 1 else ''}"
+    msg["From"] = contacts[0].from_email
+    msg["To"] = contacts[0].to_email
+    msg["Reply-To"] = ", ".join(dict.fromkeys(c.user_email for c in contacts))
+    entries = [
+        f"""{i}. {time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(c.received))}
+User Email: {c.user_email}
+User Phone: {c.user_phone}
+Message: {c.notes if c.notes else "(no message)"}
+"""
+        for i, c in enumerate(contacts, 1)
+    ]
+    msg.set_content("New contacts submitted from your portfolio:\n\n" + "\n".join(entries))
+    return msg
+
+
+# ----------------------------
+# Connection pool (a single reusable connection per config)
+# ----------------------------
+class SMTPConnection:
+    def __init__(self, config: SMTPConfig):
+        self.config = config
+        self._smtp: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def _connect(self) -> "smtplib.SMTP":
+        import smtplib
+
+        cfg = self.config
+        if cfg.tls == "ssl":
+            smtp = smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=cfg.timeout)
+        else:
+            smtp = smtplib.SMTP(cfg.host, cfg.port, timeout=cfg.timeout)
+            if cfg.tls == "starttls":
+                smtp.starttls()
+        if cfg.username and cfg.password:
+            smtp.login(cfg.username, cfg.password)
+        return smtp
+
+    def get(self) -> "smtplib.SMTP":
+        import smtplib
+
+        if self._smtp is not None and time.monotonic() - self._last_used > 5:
+            # Servers drop idle clients silently; probe before reusing
+            try:
+                self._smtp.noop()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self._smtp is None:
+            self._smtp = self._connect()
+        return self._smtp
+
+    def send(self, msg: "EmailMessage"):
+        self.get().send_message(msg)
+        self._last_used = time.monotonic()
+
+    def idle_for(self) -> float:
+        return time.monotonic() - self._last_used
+
+    def close(self):
+        if self._smtp is None:
+            return
+        import smtplib
+
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+
+# ----------------------------
+# Outbox
+# ----------------------------
+SEND_SECONDS = metrics.histogram("portfolio_smtp_send_seconds", "Time per SMTP delivery attempt, including connect/login")
+EMAILS = metrics.counter("portfolio_contact_emails_total", "Contact email delivery attempts by result")
+DIGEST_SIZE = metrics.histogram("portfolio_contact_digest_size", "Submissions per digest email",
+                                buckets=(1, 2, 5, 10, 25, 50, 100))
+
+
+class Outbox:
+    def __init__(self, config: SMTPConfig, max_attempts: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 60.0, maxsize: int = 1000):
+        self.config = config
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._queue: queue.Queue[tuple[EmailMessage, Callable | None]] = queue.Queue(maxsize=maxsize)
+        self._conn = SMTPConnection(config)
+        self._stop = threading.Event()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self._thread = threading.Thread(target=self._run, name=f"outbox-{config.host}:{config.port}", daemon=True)
+        self._thread.start()
+
+    # The submitter is CC'd on the one message
+    sends_copy = True
+
+    def submit_contact(self, contact: Contact, on_done: Callable[[bool], None] | None = None) -> bool:
+        msg = build_contact_message(contact.to_email, contact.from_email, contact.user_email,
+                                    contact.user_phone, contact.notes)
+        return self.submit(msg, on_done)
+
+    def submit(self, msg: "EmailMessage", on_done: Callable[[bool], None] | None = None) -> bool:
+        """Queue `msg` for delivery; False if the outbox is full.
+
+        `on_done(delivered)` is called from the worker thread once the message is
+        sent or given up on.
+        """
+        try:
+            self._queue.put_nowait((msg, on_done))
+        except queue.Full:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "sent": self.sent, "failed": self.failed, "retries": self.retries}
+
+    def close(self, timeout: float = 5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def join(self):
+        """Block until everything queued so far has been delivered or given up on."""
+        self._queue.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                msg, on_done = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._conn.idle_for() > self.config.idle_timeout:
+                    self._conn.close()
+                continue
+            try:
+                delivered = self._deliver(msg)
+                if on_done is not None:
+                    on_done(delivered)
+            except Exception:
+                log.exception("Contact email callback failed")
+            finally:
+                self._queue.task_done()
+        self._conn.close()
+
+    def _deliver(self, msg: "EmailMessage") -> bool:
+        import smtplib
+
+        for attempt in range(1, self.max_attempts + 1):
+            t0 = time.perf_counter()
+            try:
+                self._conn.send(msg)
+                SEND_SECONDS.observe(time.perf_counter() - t0)
+                self.sent += 1
+                EMAILS.inc(result="sent")
+                return True
+            except (smtplib.SMTPException, OSError) as e:
+                SEND_SECONDS.observe(time.perf_counter() - t0)
+                # Any error may leave the session in an unknown state; start fresh next time
+                self._conn.close()
+                if attempt == self.max_attempts:
+                    self.failed += 1
+                    EMAILS.inc(result="failed")
+                    log.error("Giving up on contact email to %s after %d attempts: %s", msg["To"], attempt, e)
+                    return False
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                self.retries += 1
+                EMAILS.inc(result="retry")
+                log.warning("Contact email attempt %d failed (%s); retrying in %.1fs", attempt, e, delay)
+                if self._stop.wait(delay):
+                    return False
+        return False
+
+
+class DigestOutbox(Outbox):
+    """Queues contacts rather than messages and sends the owner one email per batch."""
+
+    def __init__(self, config: SMTPConfig, digest: DigestConfig, **kwargs):
+        self.digest = digest
+        self.digests = 0
+        super().__init__(config, **kwargs)
+
+    @property
+    def sends_copy(self) -> bool:
+        return self.digest.copies
+
+    def submit_contact(self, contact: Contact, on_done: Callable[[bool], None] | None = None) -> bool:
+        try:
+            self._queue.put_nowait((contact, on_done))
+        except queue.Full:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {**super().stats(), "digests": self.digests}
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._conn.idle_for() > self.config.idle_timeout:
+                    self._conn.close()
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.digest.window
+            while len(batch) < self.digest.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 1.0)))
+                except queue.Empty:
+                    continue
+            # Everything in the batch was acknowledged to a visitor, so it goes out even when stopping
+            self._flush(batch)
+        self._conn.close()
+
+    def _flush(self, batch: list[tuple[Contact, Callable | None]]):
+        groups: dict[tuple[str, str], list[tuple[Contact, Callable | None]]] = {}
+        for item in batch:
+            groups.setdefault((item[0].to_email, item[0].from_email), []).append(item)
+        try:
+            for items in groups.values():
+                contacts = [contact for contact, _ in items]
+                DIGEST_SIZE.observe(len(contacts))
+                delivered = self._deliver(build_digest_message(contacts))
+                self.digests += delivered
+                if delivered and self.digest.copies:
+                    for contact in contacts:
+                        self._deliver(build_copy_message(contact))
+                for _, on_done in items:
+                    if on_done is not None:
+                        try:
+                            on_done(delivered)
+                        except Exception:
+                            log.exception("Contact email callback failed")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+@process_singleton
+def _outbox(config: SMTPConfig, digest: DigestConfig | None) -> Outbox:
+    return Outbox(config) if digest is None else DigestOutbox(config, digest)
+
+
+metrics.gauge(
+    "portfolio_outbox_queued", "Contact emails waiting for delivery",
+    lambda: {(("smtp", f"{c.host}:{c.port}"), ("digest", str(d is not None).lower())): o.stats()["queued"]
+             for (c, d), o in list(_outbox.instances.items())},
+)
+
+
+def get_outbox(config: SMTPConfig, digest: DigestConfig | None = None) -> Outbox:
+    """One outbox per SMTP config, shared by every session; batching when `digest` has a window."""
+    if digest is not None and digest.window <= 0:
+        digest = None
+    return _outbox(config, digest)
@@ -0,0 +1,75 @@
+"""Registry of hosted profiles, so one process can serve a whole team.
+
+Each extra profile is content/profiles/<slug>.toml, with the same schema as
+content/profile.toml (which stays the default), and is picked with
+`?profile=<slug>`. Parsed profiles live in the shared LRU (portfolio/lru.py)
+alongside their compiled HTML and encoded assets, so only recently viewed
+profiles stay resident. Instead of a watcher thread per profile, a file is
+re-checked on view at most every `recheck` seconds.
+"""
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+from portfolio.content import ROOT, ContentError, ContentStore, Profile, get_content
+from portfolio.lru import SHARED, LRUCache, sizeof
+
+log = logging.getLogger(__name__)
+
+PROFILES_DIR = Path(os.environ.get("PORTFOLIO_PROFILES_DIR", ROOT / "content" / "profiles"))
+SLUG_RE = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
+
+
+class ProfileRegistry:
+    def __init__(self, root: Path = PROFILES_DIR, cache: LRUCache = SHARED, recheck: float = 2.0):
+        self.root = root
+        self.cache = cache
+        self.recheck = recheck
+
+    def path_for(self, slug: str) -> Path | None:
+        # The slug pattern also keeps query strings from reaching outside root
+        if not SLUG_RE.fullmatch(slug):
+            return None
+        path = self.root / f"{slug}.toml"
+        return path if path.is_file() else None
+
+    def get(self, slug: str | None = None) -> Profile | None:
+        """The profile for `slug` (the default profile when empty); None if there is no such profile."""
+        if not slug:
+            return get_content().current
+        key = ("profile", slug)
+        entry = self.cache.get(key)  # [ContentStore, last checked]
+        now = time.monotonic()
+        if entry is None:
+            path = self.path_for(slug)
+            if path is None:
+                return None
+            try:
+                store = ContentStore(path, poll_interval=0)
+            except (OSError, ContentError) as e:
+                log.error("Profile %r is invalid: %s", slug, e)
+                return None
+            entry = [store, now]
+            self.cache.put(key, entry, sizeof(store.current))
+        elif now - entry[1] > self.recheck:
+            entry[1] = now
+            if not entry[0].path.exists():
+                self.cache.pop(key)
+                return None
+            if entry[0].reload():
+                # Re-account the new snapshot's size
+                self.cache.put(key, entry, sizeof(entry[0].current))
+        return entry[0].current
+
+    def slugs(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.stem for p in self.root.glob("*.toml") if SLUG_RE.fullmatch(p.stem))
+
+    def stats(self) -> dict:
+        return {"hosted": len(self.slugs()), **self.cache.stats("profile")}
+
+
+PROFILES = ProfileRegistry()
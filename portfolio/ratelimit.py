@@ -0,0 +1,146 @@
+"""Token-bucket rate limiting and duplicate suppression for the contact form.
+
+All tables are LRU-bounded, so memory stays flat however many distinct
+sessions or addresses hit the form. Decisions are always counted in
+`ContactGuard.counters` (see stats()), mirrored to
+portfolio_contact_guard_total{result=...} when metrics are on, and table sizes
+are reported by portfolio_contact_guard_tracked (portfolio/metrics.py).
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from portfolio import metrics
+
+GUARD_RESULTS = metrics.counter("portfolio_contact_guard_total", "Contact form guard decisions by result")
+
+
+class TokenBucketLimiter:
+    """`burst` tokens per key, refilled at `rate` tokens/second."""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def allow(self, key: str, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                # Least recently seen first; an evicted key simply starts with a full bucket again
+                self._buckets.popitem(last=False)
+        return allowed
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class Deduper:
+    """Remembers fingerprints for `window` seconds."""
+
+    def __init__(self, window: float, max_entries: int = 10_000):
+        self.window = window
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def seen(self, fingerprint: str, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            at = self._seen.get(fingerprint)
+            return at is not None and now - at < self.window
+
+    def check_and_remember(self, fingerprint: str, now: float | None = None) -> bool:
+        """True if `fingerprint` was already seen in the window; otherwise remember it. One atomic step,
+        so of two concurrent identical submissions exactly one gets through."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            at = self._seen.get(fingerprint)
+            if at is not None and now - at < self.window:
+                return True
+            self._seen.pop(fingerprint, None)
+            self._seen[fingerprint] = now
+            # Insertion order is time order, so expired entries sit at the front
+            while self._seen and (len(self._seen) > self.max_entries or now - next(iter(self._seen.values())) >= self.window):
+                self._seen.popitem(last=False)
+            return False
+
+    def forget(self, fingerprint: str):
+        with self._lock:
+            self._seen.pop(fingerprint, None)
+
+    def __len__(self):
+        return len(self._seen)
+
+
+# ----------------------------
+# Contact form guard
+# ----------------------------
+class ContactGuard:
+    def __init__(self, max_keys: int = 10_000):
+        # A person may fix a typo and resend; a script hammering the form may not
+        self.open_by_session = TokenBucketLimiter(rate=1 / 10, burst=10, max_keys=max_keys)
+        self.submit_by_session = TokenBucketLimiter(rate=1 / 60, burst=3, max_keys=max_keys)
+        self.submit_by_ip = TokenBucketLimiter(rate=1 / 30, burst=10, max_keys=max_keys)
+        self.duplicates = Deduper(window=600, max_entries=max_keys)
+        self._lock = threading.Lock()
+        self.counters = {"allowed": 0, "rejected_open": 0, "rejected_session": 0, "rejected_ip": 0, "rejected_duplicate": 0}
+
+    def _count(self, result: str):
+        with self._lock:
+            self.counters[result] += 1
+        GUARD_RESULTS.inc(result=result)
+
+    def allow_open(self, session_id: str) -> bool:
+        if self.open_by_session.allow(session_id):
+            return True
+        self._count("rejected_open")
+        return False
+
+    def check_submit(self, session_id: str, client_ip: str | None, email: str, phone: str, notes: str) -> str | None:
+        """None if the submission may go ahead, otherwise the rejection reason."""
+        fingerprint = hashlib.sha1("\0".join((email.lower(), phone, notes)).encode()).hexdigest()
+        if self.duplicates.check_and_remember(fingerprint):
+            self._count("rejected_duplicate")
+            return "duplicate"
+        rejected = None
+        if not self.submit_by_session.allow(session_id):
+            rejected = "rejected_session"
+        elif client_ip and not self.submit_by_ip.allow(client_ip):
+            rejected = "rejected_ip"
+        if rejected:
+            # Not sent, so sending it again later isn't a duplicate
+            self.duplicates.forget(fingerprint)
+            self._count(rejected)
+            return "rate"
+        self._count("allowed")
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "tracked_sessions": len(self.submit_by_session),
+            "tracked_ips": len(self.submit_by_ip),
+            "tracked_fingerprints": len(self.duplicates),
+        }
+
+
+CONTACT_GUARD = ContactGuard()
+
+metrics.gauge(
+    "portfolio_contact_guard_tracked",
+    "Keys held by the contact form guard's rate limiters and deduper",
+    lambda: {(("table", name.removeprefix("tracked_")),): n
+             for name, n in CONTACT_GUARD.stats().items() if name.startswith("tracked_")},
+)
@@ -0,0 +1,233 @@
+"""Compiles each page section from the content model into a single HTML fragment.
+
+Every section is memoized process-wide on the content version it is built from,
+so a rerun costs one cache lookup per section and one st.markdown delta instead
+of dozens. Entries live in the shared LRU (portfolio/lru.py), so every hosted
+profile gets its own compiled HTML and the least recently viewed are dropped
+first.
+"""
+import hashlib
+import json
+import os
+from html import escape
+
+from portfolio.lru import SHARED
+
+# Timeline entries rendered per page in the app; later ones load on "Show more"
+TIMELINE_PAGE = int(os.environ.get("PORTFOLIO_TIMELINE_PAGE", "5"))
+# At most this many are on the page at once; loading more drops the oldest pages
+TIMELINE_WINDOW = max(TIMELINE_PAGE, int(os.environ.get("PORTFOLIO_TIMELINE_WINDOW", "10")))
+
+
+def content_hash(*parts) -> str:
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def _memoized(section: str, version: str, build, *args) -> str:
+    # Keyed on the content hash, so profiles never collide and an edited profile
+    # simply stops hitting its old entries
+    return SHARED.get_or_build(("html", section, version), lambda: build(*args))
+
+
+def cache_info() -> dict:
+    return SHARED.stats("html")
+
+
+def _header(title: str, anchor: str = "") -> str:
+    # Anchors are what search results link to
+    id_attr = f' id="{anchor}"' if anchor else ""
+    return f'<div class="section-header"{id_attr}>{escape(title)}</div>'
+
+
+# ----------------------------
+# Section builders
+# ----------------------------
+def _picture(img: dict | None) -> str:
+    if not img:
+        return ""
+    attrs = f' width="{img["width"]}" height="{img["height"]}"' if "width" in img else ""
+    if img.get("srcset"):
+        attrs += f' srcset="{escape(img["srcset"])}"'
+    if img.get("placeholder"):
+        # Blurred preview painted behind the photo until it has loaded
+        attrs += f' style="background:center/cover url({escape(img["placeholder"])})"'
+    tag = f'<img class="profile-img" src="{escape(img["src"])}"{attrs} alt="" decoding="async"/>'
+    if not img.get("sources"):
+        return tag
+    sources = "".join(f'<source type="{escape(mime)}" srcset="{escape(srcset)}">' for mime, srcset in img["sources"])
+    return f"<picture>{sources}{tag}</picture>"
+
+
+def _target(href: str) -> str:
+    # In-page anchors stay in the tab; everything else opens a new one
+    return "" if href.startswith("#") else ' target="_blank"'
+
+
+def _build_hero(profile, img, actions) -> str:
+    img = _picture(img)
+    pill_html = "".join(f'<span class="pill">{escape(p)}</span>' for p in profile.pills)
+    action_html = "".join(
+        f'<a class="cta-link {escape(cls)}" href="{escape(href)}"{_target(href)}>{escape(label)}</a>'
+        for label, href, cls in actions
+    )
+    return (
+        '<div class="hero"><div class="hero-inner"><div class="hero-top">'
+        f'<div class="hero-left">{img}<div class="hero-text">'
+        f'<div class="name">{escape(profile.full_name)}</div>'
+        f'<div class="subtitle">{escape(profile.role)}</div>'
+        f'<div class="meta">📧 <a href="mailto:{escape(profile.email)}">{escape(profile.email)}</a>'
+        f' &nbsp; | &nbsp; 📞 {escape(profile.phone)}</div>'
+        f'<div class="pills">{pill_html}</div>'
+        '</div></div>'
+        + (f'<div class="hero-actions">{action_html}</div>' if action_html else "")
+        + '</div></div></div>'
+    )
+
+
+def _build_summary(profile) -> str:
+    return _header("Summary") + f'<div class="glass">{escape(profile.summary)}</div>'
+
+
+def _skills_list(skill_levels) -> str:
+    # The one text copy of every level: the chart's alt only summarizes it
+    groups = "".join(
+        f"<li>{escape(group)}: " + ", ".join(f"{escape(label)} {max(0, min(100, int(pct)))}%" for label, pct in items) + "</li>"
+        for group, items in skill_levels
+    )
+    return f'<details class="skills-list"><summary>Skill levels as text</summary><ul>{groups}</ul></details>'
+
+
+def _build_skills(chart: dict, skill_levels) -> str:
+    # One chart (portfolio/charts.py) instead of a card and a bar per skill
+    if "svg" in chart:
+        body = chart["svg"].replace("<svg ", f'<svg role="img" aria-label="{escape(chart["alt"])}" ', 1)
+    else:
+        img = (
+            f'<img src="{escape(chart["src"])}" width="{chart["width"]}" height="{chart["height"]}"'
+            f' alt="{escape(chart["alt"])}" loading="lazy" decoding="async"/>'
+        )
+        narrow = (
+            f'<source media="(max-width: 900px)" srcset="{escape(chart["narrow"])}"'
+            f' width="{chart["narrow_width"]}" height="{chart["narrow_height"]}">'
+        )
+        body = f"<picture>{narrow}{img}</picture>"
+    return _header("Skills", "skills") + f'<div class="skills-chart">{body}{_skills_list(skill_levels)}</div>'
+
+
+def _timeline_card(exp, i: int, details: str = "") -> str:
+    role_line = f"{exp.title} — {exp.company}"
+    meta_line = f"{exp.location} • {exp.dates}"
+    return (
+        f'<div class="t-item" id="exp-{i}"><div class="t-dot"></div><div class="t-card">'
+        f'<div class="t-top"><div class="t-role">{escape(role_line)}</div>'
+        f'<div class="t-meta">{escape(meta_line)}</div></div>'
+        f'{details}</div></div>'
+    )
+
+
+def _build_bullets(exp) -> str:
+    return f'<ul class="t-bullets">{"".join(f"<li>{escape(b)}</li>" for b in exp.bullets)}</ul>'
+
+
+def _build_timeline(profile) -> str:
+    # Everything up front with client-side <details>; used by the static export
+    items = []
+    for i, exp in enumerate(profile.experience):
+        details = (
+            '<details class="t-details">'
+            f'<summary>View details: {escape(exp.company)} ({escape(exp.dates)})</summary>'
+            f'{_build_bullets(exp)}</details>'
+        )
+        items.append(_timeline_card(exp, i, details))
+    return _header("Professional Experience", "experience") + f'<div class="timeline">{"".join(items)}</div>'
+
+
+def _build_education(profile) -> str:
+    cards = "".join(
+        '<div class="edu-card">'
+        f'<div class="edu-degree">{escape(edu.degree)}</div>'
+        f'<div class="edu-school">{escape(edu.school)} • {escape(edu.location)}<br/>{escape(edu.dates)}</div>'
+        f'<div class="edu-extra">{escape(edu.extra)}</div>'
+        '</div>'
+        for edu in profile.education
+    )
+    return _header("Education") + f'<div class="edu-grid">{cards}</div>'
+
+
+def _build_projects(repos) -> str:
+    cards = []
+    for repo in repos:
+        meta = [f"★ {repo.stars}"]
+        if repo.language:
+            meta.insert(0, escape(repo.language))
+        if repo.forks:
+            meta.append(f"⑂ {repo.forks}")
+        cards.append(
+            f'<a class="repo-card" href="{escape(repo.url)}" target="_blank">'
+            f'<div class="repo-name">{escape(repo.name)}</div>'
+            f'<div class="repo-desc">{escape(repo.description)}</div>'
+            f'<div class="repo-meta">{" • ".join(meta)}</div>'
+            '</a>'
+        )
+    return _header("Projects", "projects") + f'<div class="repo-grid">{"".join(cards)}</div>'
+
+
+def _build_coursework(profile) -> str:
+    return _header("Coursework", "coursework") + f'<div class="glass">{escape(", ".join(profile.coursework))}</div>'
+
+
+# ----------------------------
+# Public API
+# ----------------------------
+def hero_html(profile, img: dict | None, actions: list[tuple[str, str, str]] = ()) -> str:
+    """`img` is a spec from portfolio.images: src plus optional srcset, sources, placeholder, width/height.
+
+    Specs from portfolio.images carry a `key` (source path + mtime), which the
+    memo uses instead of hashing the spec: inline specs hold a data: URI.
+    """
+    actions = [list(a) for a in actions]
+    img_key = img.get("key") or content_hash(img) if img else ""
+    return _memoized("hero", f"{profile.version}:{img_key}:{content_hash(actions)}", _build_hero, profile, img, actions)
+
+
+def summary_html(profile) -> str:
+    return _memoized("summary", profile.version, _build_summary, profile)
+
+
+def skills_html(profile, chart: dict) -> str:
+    """`chart` is a spec from portfolio.charts.skills_chart: inline svg, or src/narrow URLs plus width/height."""
+    return _memoized("skills", profile.version + chart.get("src", "inline"), _build_skills, chart, profile.skill_levels)
+
+
+def timeline_html(profile) -> str:
+    """The whole timeline as one fragment, bullets included (static export)."""
+    return _memoized("timeline", profile.version, _build_timeline, profile)
+
+
+# The app's timeline is paged: one card per visible entry, with bullets built
+# only for entries whose expander is open, so a rerun costs the same however
+# long the career history is.
+def timeline_header_html() -> str:
+    return _header("Professional Experience", "experience")
+
+
+def timeline_entry_html(profile, i: int) -> str:
+    return _memoized("timeline_entry", f"{profile.version}:{i}", _timeline_card, profile.experience[i], i)
+
+
+def timeline_bullets_html(profile, i: int) -> str:
+    return _memoized("timeline_bullets", f"{profile.version}:{i}", _build_bullets, profile.experience[i])
+
+
+def education_html(profile) -> str:
+    return _memoized("education", profile.version, _build_education, profile)
+
+
+def projects_html(version: str, repos) -> str:
+    """`version, repos` as returned by portfolio.github's RepoFeed.get()."""
+    return _memoized("projects", version, _build_projects, repos) if repos else ""
+
+
+def coursework_html(profile) -> str:
+    return _memoized("coursework", profile.version, _build_coursework, profile)
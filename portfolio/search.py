@@ -0,0 +1,137 @@
+"""Full-text search over experience bullets, skills, coursework and (optionally) the resume PDF.
+
+An inverted index is built once per content version and kept in the shared LRU.
+A query is tokenized the same way as the documents; every query term is a
+prefix, expanded with two bisects over the sorted vocabulary, and a document
+must match all of them. Matches come back with the matched words wrapped in
+<mark>.
+"""
+import bisect
+import logging
+import re
+from dataclasses import dataclass
+from html import escape
+
+from portfolio import render
+from portfolio.lru import SHARED
+
+log = logging.getLogger(__name__)
+
+# Words plus the bits that make tech terms distinct: C++, C#, Node.js, 2.x
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[+#]+|\.[a-z0-9]+)*")
+_TOKEN_ANY_CASE = re.compile(TOKEN_RE.pattern, re.I)
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass(frozen=True, slots=True)
+class Doc:
+    section: str  # "Experience", "Skills", "Coursework", "Resume"
+    label: str  # where in the section, e.g. "Developer — Acme"
+    text: str
+    anchor: str  # element id to jump to on the page
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    doc: Doc
+    html: str  # escaped text with <mark> around matched words
+
+
+class SearchIndex:
+    def __init__(self, docs: list[Doc]):
+        self.docs = docs
+        postings: dict[str, set[int]] = {}
+        for i, doc in enumerate(docs):
+            for token in tokenize(f"{doc.label} {doc.text}"):
+                postings.setdefault(token, set()).add(i)
+        self.vocab = sorted(postings)
+        self.postings = [sorted(postings[t]) for t in self.vocab]
+
+    def _prefix_range(self, term: str) -> range:
+        lo = bisect.bisect_left(self.vocab, term)
+        hi = bisect.bisect_left(self.vocab, term + "\uffff", lo)
+        return range(lo, hi)
+
+    def search(self, query: str, limit: int = 20) -> list[Hit]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        matched: set[int] | None = None
+        for term in terms:
+            ids = set()
+            for v in self._prefix_range(term):
+                ids.update(self.postings[v])
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return []
+        return [Hit(self.docs[i], highlight(self.docs[i].text, terms)) for i in sorted(matched)[:limit]]
+
+
+def highlight(text: str, terms: list[str]) -> str:
+    out, pos = [], 0
+    # Matched on the original text so offsets survive case folding
+    for m in _TOKEN_ANY_CASE.finditer(text):
+        if any(m.group().lower().startswith(t) for t in terms):
+            out.append(escape(text[pos:m.start()]))
+            out.append(f"<mark>{escape(text[m.start():m.end()])}</mark>")
+            pos = m.end()
+    out.append(escape(text[pos:]))
+    return "".join(out)
+
+
+# ----------------------------
+# Documents
+# ----------------------------
+def _resume_lines(path) -> list[str]:
+    # Optional: with pypdf installed the resume's text is searchable too
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return []
+    try:
+        pages = PdfReader(path).pages
+        text = "\n".join(page.extract_text() or "" for page in pages)
+    except Exception as e:  # pypdf raises a zoo of parse errors on odd files
+        log.warning("Not indexing %s: %s", path, e)
+        return []
+    return [line.strip() for line in text.splitlines() if len(line.strip()) > 3]
+
+
+def documents(profile) -> list[Doc]:
+    docs = []
+    for i, exp in enumerate(profile.experience):
+        label = f"{exp.title} — {exp.company}"
+        # Entries past the first timeline page aren't on the page until loaded; link the section
+        anchor = f"exp-{i}" if i < render.TIMELINE_PAGE else "experience"
+        docs.extend(Doc("Experience", label, bullet, anchor) for bullet in exp.bullets)
+    for group, items in profile.skill_levels:
+        docs.extend(Doc("Skills", group, f"{label} ({pct}%)", "skills") for label, pct in items)
+    docs.extend(Doc("Coursework", "", course, "coursework") for course in profile.coursework)
+    if profile.resume.exists():
+        docs.extend(Doc("Resume", profile.resume.name, line, "") for line in _resume_lines(profile.resume))
+    return docs
+
+
+def index_for(profile) -> SearchIndex:
+    """Index for this content version, built on first use and shared by every session."""
+    try:
+        st = profile.resume.stat()
+        resume_key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        resume_key = None
+    return SHARED.get_or_build(("search", profile.version, resume_key), lambda: SearchIndex(documents(profile)))
+
+
+def results_html(hits: list[Hit], query: str) -> str:
+    if not hits:
+        return f'<div class="search-empty">No matches for “{escape(query)}”.</div>'
+    rows = []
+    for hit in hits:
+        where = escape(hit.doc.section + (f" · {hit.doc.label}" if hit.doc.label else ""))
+        if hit.doc.anchor:
+            where = f'<a href="#{escape(hit.doc.anchor)}">{where}</a>'
+        rows.append(f'<li class="search-hit"><div class="search-where">{where}</div><div>{hit.html}</div></li>')
+    return f'<ul class="search-results">{"".join(rows)}</ul>'
@@ -0,0 +1,141 @@
+"""Per-session app data with capped lists, idle eviction and a process-wide memory budget.
+
+st.session_state is left to widgets, which Streamlit drops when a session
+disconnects. Anything the app itself accumulates per visitor lives here instead:
+list entries keep only the newest `list_cap` items, sessions idle for longer
+than `ttl` are swept, and when the total passes `max_bytes` the least recently
+active sessions are shed first.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from portfolio import metrics
+from portfolio.lru import sizeof
+
+
+class SessionData:
+    __slots__ = ("values", "last_seen", "bytes")
+
+    def __init__(self):
+        self.values: dict[str, object] = {}
+        self.last_seen = time.monotonic()
+        self.bytes = sizeof(self.values)
+
+    def get(self, key: str, default=None):
+        value = self.values.get(key, default)
+        return list(value) if isinstance(value, deque) else value
+
+
+class SessionRegistry:
+    def __init__(self, ttl: float = 1800.0, max_bytes: int = 64 * 1024 * 1024, list_cap: int = 20,
+                 sweep_interval: float = 60.0):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.list_cap = list_cap
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[str, SessionData] = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self.evicted_idle = 0
+        self.evicted_budget = 0
+
+    def touch(self, session_id: str) -> SessionData:
+        """The session's data, marking it active; call once per rerun."""
+        now = time.monotonic()
+        with self._lock:
+            data = self._sessions.get(session_id)
+            if data is None:
+                data = self._sessions[session_id] = SessionData()
+                self._bytes += data.bytes
+            else:
+                self._sessions.move_to_end(session_id)
+            data.last_seen = now
+            if now - self._last_sweep > self.sweep_interval:
+                self._sweep(now)
+        return data
+
+    def append(self, session_id: str, key: str, item):
+        """Add `item` to the list at `key`, keeping only the newest `list_cap` items."""
+        self.touch(session_id)
+        with self._lock:
+            data = self._sessions.get(session_id)
+            if data is None:
+                return  # shed between touch() and here; the item isn't worth a retry
+            items = data.values.get(key)
+            if not isinstance(items, deque):
+                items = data.values[key] = deque(maxlen=self.list_cap)
+            items.append(item)
+            self._account(data)
+
+    def set(self, session_id: str, key: str, value):
+        self.touch(session_id)
+        with self._lock:
+            data = self._sessions.get(session_id)
+            if data is not None:
+                data.values[key] = value
+                self._account(data)
+
+    def drop(self, session_id: str):
+        with self._lock:
+            data = self._sessions.pop(session_id, None)
+            if data is not None:
+                self._bytes -= data.bytes
+
+    def _account(self, data: SessionData):
+        size = sizeof(data.values)
+        self._bytes += size - data.bytes
+        data.bytes = size
+        # Shed the least recently active sessions, never the one being written
+        while self._bytes > self.max_bytes and len(self._sessions) > 1:
+            _, victim = self._sessions.popitem(last=False)
+            self._bytes -= victim.bytes
+            self.evicted_budget += 1
+
+    def _sweep(self, now: float):
+        self._last_sweep = now
+        # Ordered by activity, so idle sessions are all at the front
+        while self._sessions:
+            session_id, data = next(iter(self._sessions.items()))
+            if now - data.last_seen <= self.ttl:
+                break
+            del self._sessions[session_id]
+            self._bytes -= data.bytes
+            self.evicted_idle += 1
+
+    def sweep(self):
+        with self._lock:
+            self._sweep(time.monotonic())
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [d.bytes for d in self._sessions.values()]
+            return {
+                "sessions": len(sizes),
+                "bytes": self._bytes,
+                "max_session_bytes": max(sizes, default=0),
+                "mean_session_bytes": round(self._bytes / len(sizes)) if sizes else 0,
+                "evicted_idle": self.evicted_idle,
+                "evicted_budget": self.evicted_budget,
+            }
+
+
+SESSIONS = SessionRegistry(
+    ttl=float(os.environ.get("PORTFOLIO_SESSION_TTL", "1800")),
+    max_bytes=int(float(os.environ.get("PORTFOLIO_SESSION_MB", "64")) * 1024 * 1024),
+)
+
+
+def _session_bytes() -> dict:
+    stats = SESSIONS.stats()
+    return {
+        (("stat", "total"),): stats["bytes"],
+        (("stat", "max"),): stats["max_session_bytes"],
+        (("stat", "mean"),): stats["mean_session_bytes"],
+    }
+
+
+metrics.gauge("portfolio_sessions", "Sessions holding app data", lambda: SESSIONS.stats()["sessions"])
+metrics.gauge("portfolio_session_bytes", "Approximate bytes of app data held per session", _session_bytes)
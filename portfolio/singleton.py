@@ -0,0 +1,41 @@
+"""One instance per process of the app's long-lived services (stores, feeds, outboxes).
+
+Streamlit runs app.py once per rerun of every session, so anything that owns a
+thread, a connection or a file must be created once and shared. Decorating its
+factory with `process_singleton` does that, one instance per distinct arguments.
+"""
+import functools
+import inspect
+import threading
+from collections.abc import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def process_singleton(factory: Callable[..., T]) -> Callable[..., T]:
+    """Memoize `factory` for the life of the process, shared by every session.
+
+    Arguments are bound against the signature first, so `get()` and
+    `get(DEFAULT)` share an instance. They must be hashable. The instances are
+    on the wrapper's `instances` dict, for gauges and tests.
+    """
+    signature = inspect.signature(factory)
+    instances: dict[tuple, T] = {}
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get(*args, **kwargs) -> T:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.values())
+        instance = instances.get(key)
+        if instance is None:
+            with lock:
+                instance = instances.get(key)
+                if instance is None:
+                    instance = instances[key] = factory(*args, **kwargs)
+        return instance
+
+    get.instances = instances
+    return get
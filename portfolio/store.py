@@ -0,0 +1,292 @@
+"""Durable store for contact submissions (SQLite in WAL mode).
+
+Writes go through a bounded in-memory buffer drained by a writer thread that
+commits in batches, so the submit path never waits on disk. If the buffer is
+full (the writer is stuck or gone), writes are appended to a spill file next to
+the database instead and replayed once the writer catches up.
+
+    python -m portfolio.store query --email name@gmail.com
+    python -m portfolio.store export --format csv -o submissions.csv
+"""
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from portfolio.singleton import process_singleton
+
+if TYPE_CHECKING:
+    import sqlite3
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(os.environ.get("PORTFOLIO_DB", Path(__file__).resolve().parent.parent / "data" / "submissions.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id        TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    email     TEXT NOT NULL,
+    phone     TEXT NOT NULL,
+    notes     TEXT NOT NULL DEFAULT '',
+    status    TEXT NOT NULL DEFAULT 'received',
+    profile   TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_timestamp ON submissions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_submissions_email ON submissions(email);
+"""
+COLUMNS = ("id", "timestamp", "email", "phone", "notes", "status", "profile")
+
+# The only statements the store runs, by name (the spill file stores names, never SQL)
+STATEMENTS = {
+    "add": "INSERT OR REPLACE INTO submissions (id, timestamp, email, phone, notes, status, profile)"
+           " VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "set_status": "UPDATE submissions SET status = ? WHERE id = ?",
+}
+
+
+def _connect(path: Path) -> "sqlite3.Connection":
+    # Imported here: only the first contact submission in a process opens the database
+    import sqlite3
+
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode NORMAL only fsyncs at checkpoints; a crash can lose the last
+    # batch but never corrupts the database
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _connect_ro(path: Path) -> "sqlite3.Connection":
+    import sqlite3
+
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+
+
+def query(path: Path, email: str | None = None, since: str | None = None, until: str | None = None,
+          limit: int | None = None, profile: str | None = None) -> list[dict]:
+    """Submissions newest first, read over a read-only connection (no writer, no schema changes)."""
+    where, params = [], []
+    if email:
+        where.append("email = ?")
+        params.append(email)
+    if profile is not None:
+        where.append("profile = ?")
+        params.append(profile)
+    if since:
+        where.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        where.append("timestamp < ?")
+        params.append(until)
+    sql = f"SELECT {', '.join(COLUMNS)} FROM submissions"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY timestamp DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with closing(_connect_ro(path)) as conn:
+        return [dict(zip(COLUMNS, row)) for row in conn.execute(sql, params)]
+
+
+class SubmissionStore:
+    def __init__(self, path: Path = DEFAULT_PATH, buffer_size: int = 1000, batch_size: int = 100,
+                 flush_interval: float = 0.5):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = self.path.with_name(self.path.name + ".spill.jsonl")
+        self._replay_path = self.spill_path.with_suffix(".replay")
+        with closing(_connect(self.path)) as conn, conn:
+            conn.executescript(SCHEMA)
+            # Databases created before multi-profile hosting lack the profile column
+            if "profile" not in {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}:
+                conn.execute("ALTER TABLE submissions ADD COLUMN profile TEXT NOT NULL DEFAULT ''")
+        # Bounded: if the disk stalls, writes spill to a file instead of growing memory
+        self._buffer: queue.Queue[tuple[str, tuple]] = queue.Queue(maxsize=buffer_size)
+        self._spill_lock = threading.Lock()
+        # Once anything spills, later writes follow it into the file until it is replayed, so order is kept
+        self._spilling = self.spill_path.exists() or self._replay_path.exists()
+        self._stop = threading.Event()
+        self.failed = 0  # statements that could not be committed
+        self._thread = threading.Thread(target=self._run, name="submission-store", daemon=True)
+        self._thread.start()
+
+    # ----------------------------
+    # Writes (buffered)
+    # ----------------------------
+    def add(self, record: dict) -> str:
+        submission_id = record.get("id") or uuid.uuid4().hex
+        self._enqueue(
+            "add",
+            (submission_id, record["timestamp"], record["email"], record["phone"],
+             record.get("notes", ""), record.get("status", "received"), record.get("profile", "")),
+        )
+        return submission_id
+
+    def set_status(self, submission_id: str, status: str):
+        self._enqueue("set_status", (status, submission_id))
+
+    def _enqueue(self, statement: str, params: tuple):
+        # Never block the script thread: a full buffer means the writer is stuck
+        # or gone, so park the write in the spill file (one short append, no
+        # database lock to wait for) and let the caller carry on
+        if not self._spilling:
+            try:
+                self._buffer.put_nowait((statement, params))
+                return
+            except queue.Full:
+                log.warning("Submission buffer full (writer %s); spilling to %s",
+                            "alive" if self._thread.is_alive() else "dead", self.spill_path)
+        try:
+            with self._spill_lock:
+                self._spilling = True
+                with self.spill_path.open("a") as f:
+                    f.write(json.dumps([statement, params]) + "\n")
+        except OSError as e:
+            self.failed += 1
+            log.error("Could not store submission: %s", e)
+
+    def flush(self):
+        """Block until everything buffered so far is committed."""
+        self._buffer.join()
+
+    def close(self):
+        self.flush()
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        conn = _connect(self.path)
+        while not self._stop.is_set():
+            try:
+                batch = [self._buffer.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                # Idle: the buffer has room again, so replay anything that spilled
+                self._replay_spill(conn)
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._buffer.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._commit(conn, batch)
+            except Exception:
+                # Anything unexpected must not kill the only writer
+                self.failed += len(batch)
+                log.exception("Dropping a batch of %d submission writes", len(batch))
+            finally:
+                for _ in batch:
+                    self._buffer.task_done()
+        conn.close()
+
+    def _replay_spill(self, conn: "sqlite3.Connection"):
+        if not self._spilling:
+            return
+        replaying = self._replay_path
+        try:
+            # A leftover from a failed replay goes first; only then take the current spill file
+            if not replaying.exists():
+                with self._spill_lock:
+                    if self.spill_path.exists():
+                        self.spill_path.replace(replaying)
+                    self._spilling = False
+                if not replaying.exists():
+                    return
+            batch = []
+            for line in replaying.read_text().splitlines():
+                try:
+                    statement, params = json.loads(line)
+                except ValueError:
+                    log.warning("Skipping a torn line in %s", replaying)
+                    continue
+                if statement in STATEMENTS:
+                    batch.append((statement, tuple(params)))
+            self._commit(conn, batch)
+            replaying.unlink()
+            log.info("Replayed %d spilled submission writes", len(batch))
+        except Exception:
+            log.exception("Could not replay %s; will retry", replaying)
+
+    def _commit(self, conn: "sqlite3.Connection", batch: list[tuple[str, tuple]]):
+        import sqlite3
+
+        try:
+            with conn:
+                for statement, params in batch:
+                    conn.execute(STATEMENTS[statement], params)
+            return
+        except sqlite3.Error as e:
+            if len(batch) == 1:
+                self.failed += 1
+                log.error("Could not store submission: %s", e)
+                return
+            log.warning("Batch of %d writes failed (%s); retrying one by one", len(batch), e)
+        # Rolled back as a whole; retry singly so one bad row doesn't lose its neighbours
+        for item in batch:
+            self._commit(conn, [item])
+
+    # ----------------------------
+    # Reads (indexed)
+    # ----------------------------
+    def query(self, email: str | None = None, since: str | None = None, until: str | None = None,
+              limit: int | None = None, profile: str | None = None) -> list[dict]:
+        return query(self.path, email, since, until, limit, profile)
+
+
+@process_singleton
+def get_store() -> SubmissionStore:
+    return SubmissionStore()
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+def main(argv: list[str] | None = None):
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(prog="python -m portfolio.store", description="Query or export contact submissions.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("query", "export"):
+        p = sub.add_parser(name)
+        p.add_argument("--email")
+        p.add_argument("--profile", help="profile slug; '' for the default profile")
+        p.add_argument("--since", help="ISO timestamp, inclusive")
+        p.add_argument("--until", help="ISO timestamp, exclusive")
+        p.add_argument("--limit", type=int)
+        if name == "export":
+            p.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+            p.add_argument("-o", "--output", type=Path)
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        parser.error(f"no database at {args.db}")
+    rows = query(args.db, args.email, args.since, args.until, args.limit, args.profile)
+
+    out = args.output.open("w", newline="") if getattr(args, "output", None) else sys.stdout
+    try:
+        if getattr(args, "format", "jsonl") == "csv":
+            writer = csv.DictWriter(out, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
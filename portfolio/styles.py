@@ -0,0 +1,230 @@
+"""Stylesheet build step: assets/styles.css -> deduped, minified, fingerprinted CSS.
+
+    python -m portfolio.styles     # build and report sizes
+
+Deduplication is conservative: a declaration is dropped only when a later rule
+in the same block context repeats it exactly (same property and value, with at
+least the same !important-ness) for every selector it applies to. Repeated
+properties inside one rule are fallbacks (`height:100vh;height:100dvh`) and are
+always kept, as is everything inside quoted strings.
+"""
+import re
+import sys
+import threading
+from pathlib import Path
+
+from portfolio.assets import write_atomic
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE = ROOT / "assets" / "styles.css"
+BUILD_DIR = ROOT / "build"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_WS = re.compile(r"\s+")
+_STRING = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')""")
+
+
+# ----------------------------
+# Parsing
+# ----------------------------
+def _split_top(text: str, sep: str) -> list[str]:
+    """Split on `sep` outside quotes and parentheses."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != "\\":
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _parse(css: str) -> list:
+    """Items are ("stmt", text), ("rule", selectors, decls) or ("block", prelude, children|raw)."""
+    items, i, n = [], 0, len(css)
+    while i < n:
+        while i < n and css[i].isspace():
+            i += 1
+        if i >= n:
+            break
+        # Scan to the next top-level '{' or ';'
+        j, quote, depth = i, None, 0
+        while j < n:
+            ch = css[j]
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in "'\"":
+                quote = ch
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif depth == 0 and ch in "{;":
+                break
+            j += 1
+        prelude = css[i:j].strip()
+        if j >= n or css[j] == ";":
+            if prelude:
+                items.append(("stmt", prelude))
+            i = j + 1
+            continue
+        # Find the matching '}'
+        k, level, quote = j + 1, 1, None
+        while k < n and level:
+            ch = css[k]
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in "'\"":
+                quote = ch
+            elif ch == "{":
+                level += 1
+            elif ch == "}":
+                level -= 1
+            k += 1
+        body = css[j + 1:k - 1]
+        if prelude.startswith("@"):
+            nested = prelude.startswith(("@media", "@supports", "@layer", "@container"))
+            items.append(("block", prelude, _parse(body) if nested else body))
+        else:
+            selectors = [_WS.sub(" ", s).strip() for s in _split_top(prelude, ",")]
+            decls = []
+            for d in _split_top(body, ";"):
+                if ":" not in d:
+                    continue
+                prop, value = d.split(":", 1)
+                value = value.strip()
+                important = value.lower().endswith("!important")
+                if important:
+                    value = value[:-len("!important")].strip()
+                decls.append((prop.strip().lower(), value, important))
+            items.append(("rule", selectors, decls))
+        i = k
+    return items
+
+
+# ----------------------------
+# Dedupe + minify
+# ----------------------------
+def _dedupe(items: list) -> list:
+    # Walk backwards remembering, per selector, the exact declarations later rules
+    # make (and whether any of them is !important). A later identical declaration
+    # is supported by exactly the browsers that support the earlier one, so the
+    # earlier copy can never win; a different value might be a fallback, so it stays.
+    later: dict[str, dict[tuple[str, str], bool]] = {}
+    out = []
+    for item in reversed(items):
+        if item[0] == "block" and isinstance(item[2], list):
+            item = ("block", item[1], _dedupe(item[2]))
+        elif item[0] == "rule":
+            _, selectors, decls = item
+            kept = [
+                (prop, value, important)
+                for prop, value, important in decls
+                if not all(
+                    (prop, value) in later.get(sel, {}) and (later[sel][prop, value] or not important)
+                    for sel in selectors
+                )
+            ]
+            for sel in selectors:
+                seen = later.setdefault(sel, {})
+                for prop, value, important in decls:
+                    seen[prop, value] = seen.get((prop, value), False) or important
+            if not kept:
+                continue
+            item = ("rule", selectors, kept)
+        out.append(item)
+    return out[::-1]
+
+
+def _outside_strings(text: str, fn) -> str:
+    """Apply `fn` to the parts of `text` outside quoted strings; strings pass through untouched."""
+    parts = _STRING.split(text)
+    return "".join(part if i % 2 else fn(part) for i, part in enumerate(parts))
+
+
+def _squeeze(text: str) -> str:
+    return _outside_strings(text, lambda part: _WS.sub(" ", part))
+
+
+def _min_value(value: str) -> str:
+    return _outside_strings(_squeeze(value).strip(), lambda part: re.sub(r"\s*,\s*", ",", part))
+
+
+def _min_selector(sel: str) -> str:
+    return re.sub(r"\s*([>+~])\s*", r"\1", sel)
+
+
+def _emit(items: list) -> str:
+    out = []
+    for item in items:
+        if item[0] == "stmt":
+            out.append(_squeeze(item[1]) + ";")
+        elif item[0] == "block":
+            prelude = _outside_strings(_squeeze(item[1]), lambda part: part.replace(": ", ":"))
+            body = _emit(item[2]) if isinstance(item[2], list) else _min_raw(item[2])
+            out.append(f"{prelude}{{{body}}}")
+        else:
+            _, selectors, decls = item
+            body = ";".join(f"{p}:{_min_value(v)}{'!important' if imp else ''}" for p, v, imp in decls)
+            out.append(f"{','.join(_min_selector(s) for s in selectors)}{{{body}}}")
+    return "".join(out)
+
+
+def _min_raw(body: str) -> str:
+    # Keyframes and other opaque blocks: just squeeze whitespace
+    return _outside_strings(
+        _squeeze(body).strip(), lambda part: re.sub(r"\s*([{};:,])\s*", r"\1", part).replace(";}", "}")
+    )
+
+
+def build_css(source: str) -> str:
+    return _emit(_dedupe(_parse(_COMMENT.sub("", source))))
+
+
+# ----------------------------
+# Cached build
+# ----------------------------
+_lock = threading.Lock()
+_built: dict[str, tuple[int, int, str, str, Path]] = {}
+
+
+def stylesheet(source: Path = SOURCE, prelude: str = "") -> tuple[str, Path]:
+    """Minified CSS and the path of the built file, rebuilt only when the source changes.
+
+    `prelude` is CSS placed ahead of the source (e.g. generated @font-face rules).
+    """
+    st = source.stat()
+    key = str(source)
+    stamp = (st.st_mtime_ns, st.st_size, prelude)
+    entry = _built.get(key)
+    if entry is None or entry[:3] != stamp:
+        with _lock:
+            # Sessions that queued on the lock find the build already done
+            entry = _built.get(key)
+            if entry is None or entry[:3] != stamp:
+                css = build_css(prelude + source.read_text())
+                BUILD_DIR.mkdir(exist_ok=True)
+                out = BUILD_DIR / f"{source.stem}.min.css"
+                write_atomic(out, css.encode())
+                entry = _built[key] = (*stamp, css, out)
+    return entry[3], entry[4]
+
+
+def main():
+    css, out = stylesheet(Path(sys.argv[1]) if len(sys.argv) > 1 else SOURCE)
+    src_size = SOURCE.stat().st_size
+    print(f"{out.relative_to(ROOT)}: {len(css.encode())} bytes (source {src_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
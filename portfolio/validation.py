@@ -0,0 +1,24 @@
+"""Contact-form field validation, compiled once per process.
+
+The same patterns back the server-side check in app.py and the HTML `pattern=`
+attributes of the static export, so both accept exactly the same input.
+"""
+import re
+
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+PHONE_PATTERN = r"\+?[0-9 ()-]{7,20}"
+
+# HTML pattern= is compiled with the `v` flag, which wants ( ) - escaped inside classes
+EMAIL_HTML_PATTERN = EMAIL_PATTERN
+PHONE_HTML_PATTERN = r"\+?[0-9 \(\)\-]{7,20}"
+
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+PHONE_RE = re.compile(PHONE_PATTERN)
+
+
+def valid_email(value: str | None) -> bool:
+    return EMAIL_RE.fullmatch(value or "") is not None
+
+
+def valid_phone(value: str | None) -> bool:
+    return PHONE_RE.fullmatch(value or "") is not None
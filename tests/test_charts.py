@@ -0,0 +1,40 @@
+import uuid
+from types import SimpleNamespace
+
+from portfolio import charts, render
+
+LEVELS = (("Core", (("Java", 92), ("R&D <tools>", 60))), ("Data", (("SQL", 78),)))
+
+
+def _profile():
+    return SimpleNamespace(version=uuid.uuid4().hex, skill_levels=LEVELS)
+
+
+def test_inline_chart_escapes_labels_and_keeps_a_short_alt():
+    chart = charts.skills_chart(_profile())
+    assert chart["svg"].startswith("<svg ")
+    assert "R&amp;D &lt;tools&gt;" in chart["svg"]
+    assert chart["alt"] == "Skill levels chart: 3 skills in Core, Data"
+
+
+def test_published_chart_is_built_once_per_version():
+    published = []
+
+    def publish_text(name, text):
+        published.append(name)
+        return f"static/{name}"
+
+    profile = _profile()
+    first = charts.skills_chart(profile, publish_text)
+    second = charts.skills_chart(profile, publish_text)
+    assert first is second
+    assert published == ["skills.svg", "skills-narrow.svg"]
+    assert first["narrow_width"] == charts.NARROW_WIDTH
+
+
+def test_every_level_appears_once_as_text():
+    profile = _profile()
+    html = render.skills_html(profile, charts.skills_chart(profile, lambda name, text: name))
+    assert html.count("Java 92%") == 1
+    assert "R&amp;D &lt;tools&gt; 60%" in html
+    assert 'alt="Skill levels chart: 3 skills in Core, Data"' in html
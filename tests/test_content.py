@@ -0,0 +1,78 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from portfolio.content import ROOT, ContentError, ContentStore
+from portfolio.lru import LRUCache
+from portfolio.profiles import ProfileRegistry
+
+SOURCE = ROOT / "content" / "profile.toml"
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "jane.toml"
+    shutil.copyfile(SOURCE, path)
+    return path
+
+
+def _edit(path, old: str, new: str):
+    stat = path.stat()
+    path.write_text(path.read_text().replace(old, new, 1))
+    # Same-second edits on coarse filesystems would otherwise look unchanged
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_reload_swaps_in_an_edited_file(path):
+    store = ContentStore(path, poll_interval=0)
+    before = store.current
+    assert not store.reload()
+
+    _edit(path, 'role = "', 'role = "Senior ')
+    assert store.reload()
+    assert store.current.role.startswith("Senior ")
+    assert store.current.version != before.version
+
+
+def test_touch_without_changes_keeps_the_snapshot(path):
+    store = ContentStore(path, poll_interval=0)
+    before = store.current
+    _edit(path, "", "")
+    assert not store.reload()
+    assert store.current is before
+
+
+def test_bad_edit_keeps_the_last_good_snapshot(path):
+    store = ContentStore(path, poll_interval=0)
+    before = store.current
+    _edit(path, "full_name = ", "full_name = [")
+    assert not store.reload()
+    assert store.current is before
+
+    # A bad file at startup fails loudly instead
+    with pytest.raises(ContentError):
+        ContentStore(path, poll_interval=0)
+
+
+def test_watcher_picks_up_edits(path):
+    store = ContentStore(path, poll_interval=0.05)
+    _edit(path, 'role = "', 'role = "Senior ')
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not store.current.role.startswith("Senior "):
+        time.sleep(0.02)
+    store.close()
+    assert store.current.role.startswith("Senior ")
+
+
+def test_registry_rechecks_hosted_profiles(path):
+    registry = ProfileRegistry(path.parent, LRUCache(1 << 20), recheck=0)
+    assert registry.get("../jane") is None
+    first = registry.get("jane")
+
+    _edit(path, 'role = "', 'role = "Senior ')
+    assert registry.get("jane").version != first.version
+
+    path.unlink()
+    assert registry.get("jane") is None
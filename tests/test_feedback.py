@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from portfolio import feedback, metrics
+from portfolio.feedback import FeedbackAggregator
+
+
+def test_concurrent_writers_spread_over_shards():
+    agg = FeedbackAggregator(path=None, shards=8)
+    writers = 8
+    barrier = threading.Barrier(writers)
+
+    def write():
+        barrier.wait()  # all alive at once, so no thread ident is reused
+        for _ in range(100):
+            agg.record(5)
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    used = [shard for shard in agg._shards if any(shard.pending)]
+    assert len(used) > 1
+    assert agg.summary()["counts"][5] == writers * 100
+
+
+def test_summary_is_exported(monkeypatch):
+    agg = FeedbackAggregator(path=None)
+    agg.record(4)
+    agg.record(4)
+    agg.record(2)
+    monkeypatch.setitem(feedback.get_aggregator.instances, (), agg)
+    text = metrics.exposition()
+    assert 'portfolio_feedback_ratings{rating="4"} 2' in text
+    assert 'portfolio_feedback_window_ratings{rating="2"} 1' in text
+
+
+def test_failed_flush_keeps_the_counts(tmp_path):
+    path = tmp_path / "feedback.jsonl"
+    agg = FeedbackAggregator(path=path, flush_interval=0)
+    agg.record(3)
+    agg.record(3)
+    path.mkdir()  # appending to a directory fails like a full disk or read-only data/ would
+
+    with pytest.raises(OSError):
+        agg.flush()
+
+    path.rmdir()
+    assert agg.flush() == {"3": 2}
+    assert FeedbackAggregator(path=path, flush_interval=0).summary()["counts"][3] == 2
+
+
+def test_flusher_survives_write_errors(tmp_path):
+    path = tmp_path / "feedback.jsonl"
+    agg = FeedbackAggregator(path=path, flush_interval=0.01)
+    path.mkdir()
+    agg.record(1)
+    time.sleep(0.05)
+    path.rmdir()
+    agg.record(1)
+    time.sleep(0.05)
+    agg.close()
+    assert FeedbackAggregator(path=path, flush_interval=0).summary()["counts"][1] == 2
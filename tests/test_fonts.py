@@ -0,0 +1,46 @@
+import json
+import os
+
+from portfolio import fonts
+
+
+def _use_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(fonts, "FONTS_DIR", tmp_path)
+    monkeypatch.setattr(fonts, "MANIFEST", tmp_path / "fonts.json")
+    fonts._read_manifest.cache_clear()
+
+
+def test_without_built_fonts_the_google_import_stays(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path)
+    assert fonts.font_face_css(str) == fonts.GOOGLE_IMPORT
+    assert fonts.preload_links(str) == ""
+
+
+def test_built_fonts_replace_the_import(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path)
+    entries = [{"family": "Space Grotesk", "file": "SpaceGrotesk-subset.woff2", "weight": "300 700"}]
+    fonts.MANIFEST.write_text(json.dumps(entries))
+
+    css = fonts.font_face_css(lambda p: p.name)
+    assert "@import" not in css
+    assert 'font-family:"Space Grotesk";src:url(SpaceGrotesk-subset.woff2) format("woff2");font-weight:300 700' in css
+    assert 'href="SpaceGrotesk-subset.woff2"' in fonts.preload_links(lambda p: p.name)
+
+
+def test_manifest_is_parsed_once_per_version(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path)
+    fonts.MANIFEST.write_text("[]")
+    fonts.manifest()
+    fonts.manifest()
+    assert fonts._read_manifest.cache_info().misses == 1
+
+    fonts.MANIFEST.write_text('[{"family": "X", "file": "x.woff2", "weight": "400"}]')
+    st = fonts.MANIFEST.stat()
+    os.utime(fonts.MANIFEST, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert fonts.manifest()[0]["family"] == "X"
+
+
+def test_subset_text_covers_latin_beyond_the_sources():
+    text = fonts.used_text()
+    for ch in "AzÉñŒ–—’…€":
+        assert ch in text
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks import github_stub
+from portfolio import github
+from portfolio.github import RepoFeed
+
+
+@pytest.fixture
+def server():
+    server = github_stub.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _refreshed(feed: RepoFeed, requests_before: int, server, timeout: float = 5.0):
+    feed.get()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and (feed._refreshing or server.requests == requests_before):
+        time.sleep(0.01)
+    return feed.snapshot
+
+
+def test_username():
+    assert github.username("https://github.com/mbalisetti") == "mbalisetti"
+    assert github.username("https://github.com/mbalisetti/repo") is None
+    assert github.username("https://gitlab.com/mbalisetti") is None
+
+
+def test_refresh_saves_a_snapshot_and_revalidates_with_etag(server, tmp_path):
+    feed = RepoFeed("stub", api_url=github_stub.url(server), ttl=0, snapshot_dir=tmp_path)
+    version, repos = _refreshed(feed, 0, server)
+    assert repos and repos == tuple(sorted(repos, key=lambda r: (r.stars, r.pushed_at), reverse=True))
+    assert feed.path.exists()
+
+    _refreshed(feed, server.requests, server)
+    assert server.not_modified == 1
+    assert feed.snapshot[0] == version
+
+    # A restart serves the snapshot and, while it's fresh, doesn't ask again
+    restarted = RepoFeed("stub", api_url=github_stub.url(server), ttl=900, snapshot_dir=tmp_path)
+    requests = server.requests
+    assert restarted.get() == (version, repos)
+    time.sleep(0.05)
+    assert server.requests == requests
+
+
+@pytest.mark.parametrize("payload", [{"message": "API rate limit exceeded"}, ["not a repo"], [{"fork": False}]])
+def test_unexpected_payload_keeps_the_last_snapshot(server, tmp_path, payload):
+    feed = RepoFeed("stub", api_url=github_stub.url(server), ttl=0, retry=0, snapshot_dir=tmp_path)
+    good = _refreshed(feed, 0, server)
+    server.repos = payload
+    _refreshed(feed, server.requests, server)
+    assert feed.snapshot == good
+
+
+def test_concurrent_snapshot_saves(tmp_path):
+    feed = RepoFeed("stub", snapshot_dir=tmp_path)
+    feed._swap((github.Repo("r", "https://github.com/stub/r", "", "", 1, 0, ""),))
+    errors = []
+    barrier = threading.Barrier(8)
+
+    def save():
+        barrier.wait()
+        for _ in range(20):
+            try:
+                feed._save_snapshot()
+            except Exception as e:  # _save_snapshot only logs OSError; anything else is a bug
+                errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert [p.name for p in tmp_path.iterdir()] == ["stub.json"]
@@ -0,0 +1,51 @@
+import os
+import shutil
+import uuid
+from types import SimpleNamespace
+
+from portfolio import images, render
+
+PHOTO = images.ROOT / "assets" / "profile.jpeg"
+
+
+def _profile():
+    return SimpleNamespace(version=uuid.uuid4().hex, pills=("Java",), full_name="A", role="B",
+                           email="a@example.com", phone="5551234567")
+
+
+def _photo(tmp_path):
+    path = tmp_path / "photo.jpeg"
+    shutil.copyfile(PHOTO, path)
+    return path
+
+
+def test_hero_memo_does_not_hash_the_inline_image(monkeypatch, tmp_path):
+    img = images.inline_image(_photo(tmp_path), lambda p: "AAAA")
+    hashed = []
+    real = render.content_hash
+    monkeypatch.setattr(render, "content_hash", lambda *parts: hashed.append(parts) or real(*parts))
+
+    profile = _profile()
+    html = render.hero_html(profile, img)
+    assert render.hero_html(profile, img) is html
+    assert "data:image/webp;base64,AAAA" in html
+    assert all(img not in parts for parts in hashed)
+
+
+def test_hero_memo_follows_the_photo(tmp_path):
+    path = _photo(tmp_path)
+    profile = _profile()
+    prefix = ["old"]
+
+    def url_for(p):
+        return f"{prefix[0]}/{p.name}"
+
+    before = render.hero_html(profile, images.responsive_image(path, url_for))
+    prefix[0] = "new"
+    # Unchanged photo: a rerun is a cache hit, whatever the spec holds
+    assert render.hero_html(profile, images.responsive_image(path, url_for)) is before
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    after = render.hero_html(profile, images.responsive_image(path, url_for))
+    assert "old/" in before and "new/" in after
@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_rerun_log_line_reaches_stderr():
+    # A fresh interpreter with no logging configured, like a Streamlit worker
+    code = (
+        "from portfolio import metrics\n"
+        "metrics.begin_rerun()\n"
+        "with metrics.timed('hero'):\n"
+        "    pass\n"
+        "metrics.end_rerun(profile='demo')\n"
+    )
+    env = {**os.environ, "PORTFOLIO_METRICS": "1", "PORTFOLIO_METRICS_LOG": "1", "PORTFOLIO_METRICS_PORT": "0"}
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+    line = json.loads(proc.stderr.strip().splitlines()[-1])
+    assert line["event"] == "rerun"
+    assert line["profile"] == "demo"
+    assert "hero" in line["sections"]
@@ -0,0 +1,86 @@
+import socket
+
+import pytest
+
+from benchmarks import smtp_stub
+from portfolio import outbox
+from portfolio.outbox import Contact, DigestConfig, DigestOutbox, Outbox, SMTPConfig
+
+
+@pytest.fixture
+def server():
+    server = smtp_stub.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _config(server) -> SMTPConfig:
+    return SMTPConfig.from_secrets(smtp_stub.secrets(server))
+
+
+def _contact(user: str, to: str = "owner@example.com") -> Contact:
+    return Contact(to, "portfolio@example.com", user, "5551234567", "")
+
+
+def _collect():
+    results = []
+    return results, results.append
+
+
+def test_contact_message_copies_the_submitter():
+    msg = outbox.build_contact_message("owner@example.com", "portfolio@example.com", "a@example.com", "555", "")
+    assert msg["Cc"] == "a@example.com"
+    assert "(no message)" in msg.get_content()
+
+
+def test_messages_share_one_connection(server):
+    box = Outbox(_config(server))
+    results, on_done = _collect()
+    for user in ("a@example.com", "b@example.com", "c@example.com"):
+        assert box.submit_contact(_contact(user), on_done)
+    box.join()
+    box.close()
+    assert results == [True, True, True]
+    assert (server.delivered, server.connections) == (3, 1)
+
+
+def test_gives_up_after_max_attempts():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # nothing listens here once closed
+    box = Outbox(SMTPConfig(host="127.0.0.1", port=port, tls="none", timeout=1), max_attempts=2, base_delay=0)
+    results, on_done = _collect()
+    box.submit_contact(_contact("a@example.com"), on_done)
+    box.join()
+    box.close()
+    assert results == [False]
+    assert (box.failed, box.retries) == (1, 1)
+
+
+def test_digest_sends_one_email_per_owner_plus_copies(server):
+    box = DigestOutbox(_config(server), DigestConfig(window=0.2))
+    results, on_done = _collect()
+    for user, to in [("a@example.com", "one@example.com"), ("b@example.com", "two@example.com"),
+                     ("c@example.com", "one@example.com")]:
+        box.submit_contact(_contact(user, to), on_done)
+    box.join()
+    box.close()
+    assert results == [True, True, True]
+    assert box.digests == 2
+    assert server.delivered == 2 + 3
+
+
+def test_digest_message_lists_every_contact():
+    msg = outbox.build_digest_message([_contact("a@example.com"), _contact("b@example.com")])
+    assert msg["Subject"] == "2 New Portfolio Contact Submissions"
+    assert msg["Reply-To"] == "a@example.com, b@example.com"
+    assert "1. " in msg.get_content() and "2. " in msg.get_content()
+
+
+def test_get_outbox_shares_one_per_config(server):
+    config = _config(server)
+    box = outbox.get_outbox(config, DigestConfig(window=0))
+    assert type(box) is Outbox
+    assert outbox.get_outbox(config) is box
+    assert isinstance(outbox.get_outbox(config, DigestConfig(window=1)), DigestOutbox)
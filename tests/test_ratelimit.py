@@ -0,0 +1,55 @@
+import threading
+
+from portfolio import metrics
+from portfolio.ratelimit import GUARD_RESULTS, ContactGuard
+
+
+def test_guard_decisions_are_exported(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(GUARD_RESULTS, "_values", {})
+    guard = ContactGuard()
+
+    assert guard.check_submit("s1", "10.0.0.1", "a@example.com", "5551234567", "") is None
+    assert guard.check_submit("s1", "10.0.0.1", "a@example.com", "5551234567", "") == "duplicate"
+
+    text = metrics.exposition()
+    assert 'portfolio_contact_guard_total{result="allowed"} 1' in text
+    assert 'portfolio_contact_guard_total{result="rejected_duplicate"} 1' in text
+    assert 'portfolio_contact_guard_tracked{table="sessions"}' in text
+
+
+def test_decisions_are_counted_with_metrics_off(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    guard = ContactGuard()
+    guard.check_submit("s1", None, "a@example.com", "5551234567", "")
+    guard.check_submit("s1", None, "a@example.com", "5551234567", "")
+    stats = guard.stats()
+    assert stats["allowed"] == 1
+    assert stats["rejected_duplicate"] == 1
+
+
+def test_concurrent_duplicates_send_once():
+    guard = ContactGuard()
+    barrier = threading.Barrier(16)
+    results = []
+
+    def submit(i):
+        barrier.wait()
+        results.append(guard.check_submit(f"s{i}", None, "a@example.com", "5551234567", "hi"))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results.count(None) == 1
+    assert results.count("duplicate") == 15
+
+
+def test_rate_limited_submission_is_not_remembered():
+    guard = ContactGuard()
+    for i in range(3):
+        assert guard.check_submit("s1", None, f"{i}@example.com", "5551234567", "") is None
+    assert guard.check_submit("s1", None, "late@example.com", "5551234567", "") == "rate"
+    # Another session may send the same message: it was never sent
+    assert guard.check_submit("s2", None, "late@example.com", "5551234567", "") is None
@@ -0,0 +1,31 @@
+import threading
+
+from portfolio.singleton import process_singleton
+
+
+def test_one_instance_per_arguments_under_concurrency():
+    built = []
+
+    @process_singleton
+    def get(name: str, size: int = 1):
+        built.append(name)
+        return object()
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(get("a"))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(r) for r in results}) == 1
+    assert get("a", 1) is get(name="a") is results[0]
+    assert get("b") is not results[0]
+    assert built == ["a", "b"]
+    assert set(get.instances) == {("a", 1), ("b", 1)}
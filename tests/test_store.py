@@ -0,0 +1,73 @@
+import threading
+import time
+
+from portfolio import store
+from portfolio.store import SubmissionStore
+
+
+def _record(email, **extra):
+    return {"timestamp": "2026-01-01T00:00:00", "email": email, "phone": "5551234567", **extra}
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_writes_are_batched_and_queryable(tmp_path):
+    s = SubmissionStore(tmp_path / "s.db", flush_interval=0.05)
+    first = s.add(_record("a@example.com", profile="team-a"))
+    s.add(_record("b@example.com"))
+    s.set_status(first, "sent")
+    s.close()
+
+    rows = store.query(tmp_path / "s.db", profile="team-a")
+    assert [(r["email"], r["status"]) for r in rows] == [("a@example.com", "sent")]
+    assert len(store.query(tmp_path / "s.db")) == 2
+
+
+def test_a_bad_row_does_not_lose_its_batch_or_the_writer(tmp_path):
+    s = SubmissionStore(tmp_path / "s.db", flush_interval=0.05)
+    s.add(_record("a@example.com"))
+    s.add(_record(object()))  # can't be bound
+    s.add(_record("b@example.com"))
+    s.flush()
+    assert s._thread.is_alive()
+    assert s.failed == 1
+    assert {r["email"] for r in s.query()} == {"a@example.com", "b@example.com"}
+    s.close()
+
+
+def test_full_buffer_spills_without_blocking_and_replays_in_order(tmp_path):
+    path = tmp_path / "s.db"
+    s = SubmissionStore(path, buffer_size=1, flush_interval=0.05)
+    s._stop.set()  # a writer that is gone
+    s._thread.join()
+
+    started = time.monotonic()
+    s.add(_record("buffered@example.com"))
+    spilled = s.add(_record("spilled@example.com"))
+    s.set_status(spilled, "sent")
+    assert time.monotonic() - started < 0.5
+    assert len(s.spill_path.read_text().splitlines()) == 2
+
+    # The next process replays the spill file once its writer is idle
+    again = SubmissionStore(path, flush_interval=0.05)
+    assert _wait_for(lambda: not s.spill_path.exists() and again.query())
+    assert [(r["email"], r["status"]) for r in again.query()] == [("spilled@example.com", "sent")]
+    again.close()
+
+
+def test_cli_reads_without_starting_a_writer(tmp_path, capsys):
+    s = SubmissionStore(tmp_path / "s.db", flush_interval=0.05)
+    s.add(_record("a@example.com"))
+    s.close()
+
+    before = {t.name for t in threading.enumerate()}
+    store.main(["--db", str(tmp_path / "s.db"), "query", "--email", "a@example.com"])
+    assert "a@example.com" in capsys.readouterr().out
+    assert {t.name for t in threading.enumerate()} == before
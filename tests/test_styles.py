@@ -0,0 +1,61 @@
+import threading
+
+from portfolio import styles
+from portfolio.styles import build_css
+
+
+def test_fallbacks_within_a_rule_are_kept():
+    assert build_css(".a{height:100vh;height:100dvh}") == ".a{height:100vh;height:100dvh}"
+
+
+def test_different_values_across_rules_are_kept():
+    assert build_css(".a{color:red}\n.a{color:blue}") == ".a{color:red}.a{color:blue}"
+
+
+def test_identical_declaration_overridden_later_is_dropped():
+    assert build_css(".a{color:red;margin:0}\n.a{color:red}") == ".a{margin:0}.a{color:red}"
+
+
+def test_only_dropped_when_every_selector_repeats_it():
+    assert build_css(".a,.b{color:red}.a{color:red}") == ".a,.b{color:red}.a{color:red}"
+
+
+def test_important_is_not_dropped_for_a_plain_repeat():
+    assert build_css(".a{color:red !important}.a{color:red}") == ".a{color:red!important}.a{color:red}"
+
+
+def test_quoted_strings_pass_through():
+    css = build_css('.a{content:"a  b" ; font-family: "Space  Grotesk" , sans-serif}'
+                    '@keyframes k{ from { content: "x ; y" } }')
+    assert css == '.a{content:"a  b";font-family:"Space  Grotesk",sans-serif}@keyframes k{from{content:"x ; y"}}'
+
+
+def test_media_blocks_dedupe_independently():
+    css = build_css("@media (max-width: 900px){ .a{color:red} } .a{color:red}")
+    assert css == "@media (max-width:900px){.a{color:red}}.a{color:red}"
+
+
+def test_stylesheet_builds_once_under_concurrency(monkeypatch, tmp_path):
+    source = tmp_path / "site.css"
+    source.write_text(".a { color: red }")
+    monkeypatch.setattr(styles, "BUILD_DIR", tmp_path / "build")
+    builds = []
+    real = styles.build_css
+    monkeypatch.setattr(styles, "build_css", lambda text: builds.append(text) or real(text))
+
+    barrier = threading.Barrier(8)
+
+    def render():
+        barrier.wait()
+        styles.stylesheet(source)
+
+    threads = [threading.Thread(target=render) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    css, out = styles.stylesheet(source)
+    assert len(builds) == 1
+    assert out.read_text() == css == ".a{color:red}"
+    assert [p.name for p in out.parent.iterdir()] == ["site.min.css"]